@@ -0,0 +1,73 @@
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+def hash_content(content: str) -> str:
+    """Content address of a text, used as cache key"""
+    return hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+class LRUCache:
+    """
+    In-process least recently used cache with a fixed number of entries and an optional time to live in seconds.
+    A max_size of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is not None:
+            created, value = entry
+            if not self.expired(created):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self.entries[key]
+        self.misses += 1
+        return default
+
+    def expired(self, created: float) -> bool:
+        return self.ttl is not None and time.monotonic() - created >= self.ttl
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = (time.monotonic(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Like get, without counting a hit or miss and without refreshing the entry"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if self.expired(entry[0]):
+            del self.entries[key]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -16,6 +16,7 @@ class Chunk:
         self.vector = None
         self.doc_uuid = None
         self.pca = [0, 0, 0]
+        self.pca_version = 0
         self.start_i = start_i
         self.end_i = end_i
         self.content_without_overlap = content_without_overlap
@@ -29,6 +30,7 @@ class Chunk:
             "doc_uuid": self.doc_uuid,
             "title": self.title,
             "pca": self.pca,
+            "pca_version": self.pca_version,
             "start_i": self.start_i,
             "end_i": self.end_i,
             "content_without_overlap": self.content_without_overlap,
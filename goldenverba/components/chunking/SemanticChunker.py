@@ -7,7 +7,7 @@ with contextlib.suppress(Exception):
 
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, process_spacy_docs
 from goldenverba.components.types import InputConfig
 from goldenverba.components.interfaces import Embedding
 
@@ -21,6 +21,7 @@ class SemanticChunker(Chunker):
 
     def __init__(self):
         super().__init__()
+        self.requires_spacy = True
         self.name = "Semantic"
         self.requires_library = ["sklearn"]
         self.description = (
@@ -55,6 +56,8 @@ class SemanticChunker(Chunker):
         )
         max_sentences = int(config["Max Sentences Per Chunk"].value)
 
+        process_spacy_docs(documents)
+
         for document in documents:
 
             # Skip if document already contains chunks
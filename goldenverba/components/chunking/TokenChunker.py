@@ -2,7 +2,7 @@ from wasabi import msg
 
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, process_spacy_docs
 from goldenverba.components.types import InputConfig
 from goldenverba.components.interfaces import Embedding
 
@@ -14,6 +14,7 @@ class TokenChunker(Chunker):
 
     def __init__(self):
         super().__init__()
+        self.requires_spacy = True
         self.name = "Token"
         self.description = "Splits documents based on word tokens"
         self.config = {
@@ -42,14 +43,16 @@ class TokenChunker(Chunker):
         units = int(config["Tokens"].value)
         overlap = int(config["Overlap"].value)
 
-        for document in documents:
+        process_spacy_docs(documents)
 
-            doc = document.spacy_doc
+        for document in documents:
 
             # Skip if document already contains chunks
             if len(document.chunks) > 0:
                 continue
 
+            doc = document.spacy_doc
+
             # If Split Size is higher than actual Token Count or if Split Size is Zero
             if units > len(doc) or units == 0:
                 document.chunks.append(
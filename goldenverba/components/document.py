@@ -4,30 +4,70 @@ from spacy.tokens import Doc
 from spacy.language import Language
 import spacy
 import json
+import os
+import threading
 
 from langdetect import detect
 
+# Characters used to detect the language of a document
+LANGUAGE_SAMPLE_SIZE = 10000
+# Characters processed by spaCy at once
+MAX_BATCH_SIZE = 500000
 
-def load_nlp_for_language(language: str):
-    """Load SpaCy models based on language"""
-    if language == "en":
-        nlp = spacy.blank("en")
-    elif language == "zh":
-        nlp = spacy.blank("zh")
-    elif language == "zh-hant":
-        nlp = spacy.blank("zh-hant")
-    elif language == "fr":
-        nlp = spacy.blank("fr")
-    elif language == "de":
-        nlp = spacy.blank("de")
-    elif language == "nl":
-        nlp = spacy.blank("nl")
-    else:
-        nlp = spacy.blank("en")
 
-    nlp.add_pipe("sentencizer")
+SUPPORTED_LANGUAGES = ["en", "zh", "zh-hant", "fr", "de", "nl"]
 
-    return nlp
+# Shared spaCy pipelines, built once per language
+_nlp_pipelines: dict[str, list] = {}
+_nlp_lock = threading.Lock()
+# Rebuild a pipeline after this many documents, its vocab keeps every string it has seen
+NLP_PIPELINE_MAX_USES = int(os.getenv("VERBA_NLP_PIPELINE_MAX_USES", 1000))
+
+
+def load_nlp_for_language(language: str, documents: int = 1) -> Language:
+    """Load SpaCy models based on language, the pipeline is shared between all Documents of the process
+    @parameter: documents : int - Number of documents the pipeline will process, counted towards VERBA_NLP_PIPELINE_MAX_USES
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        language = "en"
+
+    with _nlp_lock:
+        entry = _nlp_pipelines.get(language)
+        if entry is None or entry[1] >= NLP_PIPELINE_MAX_USES:
+            nlp = spacy.blank(language)
+            nlp.add_pipe("sentencizer")
+            entry = [nlp, 0]
+            _nlp_pipelines[language] = entry
+        entry[1] += documents
+        return entry[0]
+
+
+def warm_nlp_pipelines(languages: list[str]):
+    """Build the spaCy pipelines of the given languages ahead of the first import"""
+    for language in languages:
+        load_nlp_for_language(language, documents=0)
+
+
+def process_spacy_docs(documents: list["Document"], batch_size: int = 32):
+    """Process the spaCy Docs of many documents in one nlp.pipe pass per language"""
+    by_language: dict[str, list[Document]] = {}
+    for document in documents:
+        if (
+            document._spacy_doc is None
+            and len(document.chunks) == 0
+            and len(document.content) <= MAX_BATCH_SIZE
+        ):
+            language = detect_language(document.content[0:LANGUAGE_SAMPLE_SIZE])
+            by_language.setdefault(language, []).append(document)
+
+    for language, language_documents in by_language.items():
+        nlp = load_nlp_for_language(language, documents=len(language_documents))
+        spacy_docs = nlp.pipe(
+            (document.content for document in language_documents),
+            batch_size=batch_size,
+        )
+        for document, spacy_doc in zip(language_documents, spacy_docs):
+            document._spacy_doc = spacy_doc
 
 
 def detect_language(text: str) -> str:
@@ -64,27 +104,34 @@ class Document:
         self.meta = meta
         self.metadata = metadata
         self.chunks: list[Chunk] = []
+        self._spacy_doc: Doc | None = None
+
+    @property
+    def spacy_doc(self) -> Doc:
+        """spaCy Doc of the content, only processed when a Chunker needs it"""
+        if self._spacy_doc is None:
+            self._spacy_doc = self.process_content()
+        return self._spacy_doc
 
-        MAX_BATCH_SIZE = 500000
+    def release_spacy_doc(self):
+        """Free the spaCy Doc once chunking is done"""
+        self._spacy_doc = None
 
-        if len(content) > MAX_BATCH_SIZE:
+    def process_content(self) -> Doc:
+        detected_language = detect_language(self.content[0:LANGUAGE_SAMPLE_SIZE])
+        nlp = load_nlp_for_language(detected_language)
+
+        if len(self.content) > MAX_BATCH_SIZE:
             # Process content in batches
             docs = []
-            detected_language = detect_language(content[0:MAX_BATCH_SIZE])
-            nlp = load_nlp_for_language(detected_language)
-
-            for i in range(0, len(content), MAX_BATCH_SIZE):
-                docs.append(nlp(content[i : i + MAX_BATCH_SIZE]))
+            for i in range(0, len(self.content), MAX_BATCH_SIZE):
+                docs.append(nlp(self.content[i : i + MAX_BATCH_SIZE]))
 
             # Merged all processed docs
-            doc = Doc.from_docs(docs)
+            return Doc.from_docs(docs)
         else:
             # Process smaller content, directly based on language
-            detected_language = detect_language(content)
-            nlp = load_nlp_for_language(detected_language)
-            doc = nlp(content)
-
-        self.spacy_doc = doc
+            return nlp(self.content)
 
     @staticmethod
     def to_json(document) -> dict:
@@ -1,9 +1,9 @@
 import os
 import requests
-import aiohttp
 import json
 
 from goldenverba.components.interfaces import Embedding
+from goldenverba.components.sessions import get_http_session
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
 
@@ -55,16 +55,16 @@ class CohereEmbedder(Embedding):
 
         all_embeddings = []
 
-        async with aiohttp.ClientSession() as session:
-            for chunk in chunks(content, 96):
-                data = {"texts": chunk, "model": model, "input_type": "search_document"}
-                async with session.post(
-                    self.url + "/embed", data=json.dumps(data), headers=headers
-                ) as response:
-                    response.raise_for_status()
-                    response_data = await response.json()
-                    embeddings = response_data.get("embeddings", [])
-                    all_embeddings.extend(embeddings)
+        session = get_http_session(self.url)
+        for chunk in chunks(content, 96):
+            data = {"texts": chunk, "model": model, "input_type": "search_document"}
+            async with session.post(
+                self.url + "/embed", data=json.dumps(data), headers=headers
+            ) as response:
+                response.raise_for_status()
+                response_data = await response.json()
+                embeddings = response_data.get("embeddings", [])
+                all_embeddings.extend(embeddings)
 
         return all_embeddings
 
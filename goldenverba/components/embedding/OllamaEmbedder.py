@@ -1,10 +1,10 @@
 import os
 import requests
 from wasabi import msg
-import aiohttp
 from urllib.parse import urljoin
 
 from goldenverba.components.interfaces import Embedding
+from goldenverba.components.sessions import get_http_session
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
 
@@ -33,12 +33,12 @@ class OllamaEmbedder(Embedding):
 
         data = {"model": model, "input": content}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(urljoin(self.url, "/api/embed"), json=data) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings = data.get("embeddings", [])
-                return embeddings
+        session = get_http_session(self.url)
+        async with session.post(urljoin(self.url, "/api/embed"), json=data) as response:
+            response.raise_for_status()
+            data = await response.json()
+            embeddings = data.get("embeddings", [])
+            return embeddings
 
 
 def get_models(url: str):
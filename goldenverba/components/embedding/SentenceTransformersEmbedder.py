@@ -1,10 +1,72 @@
+import os
+import asyncio
+import threading
+from typing import Callable
+
+from wasabi import msg
+
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 
 try:
     from sentence_transformers import SentenceTransformer
 except Exception as e:
-    pass
+    SentenceTransformer = None
+
+
+class MicroBatcher:
+    """
+    Merges concurrent encode requests (queries and import batches) into single encode calls,
+    which run one at a time in a worker thread.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], list[list[float]]],
+        max_batch_size: int = 256,
+        max_wait: float = 0.005,
+    ):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.pending: list[tuple[list[str], asyncio.Future]] = []
+        self.task: asyncio.Task | None = None
+
+    async def submit(self, content: list[str]) -> list[list[float]]:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((content, future))
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return await future
+
+    async def run(self):
+        while self.pending:
+            # Give concurrent requests the chance to join the batch
+            await asyncio.sleep(self.max_wait)
+
+            batch, size = [], 0
+            while self.pending and (
+                not batch or size + len(self.pending[0][0]) <= self.max_batch_size
+            ):
+                content, future = self.pending.pop(0)
+                batch.append((content, future))
+                size += len(content)
+
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.encode, [text for content, _ in batch for text in content]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for content, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[offset : offset + len(content)])
+                offset += len(content)
 
 
 class SentenceTransformersEmbedder(Embedding):
@@ -32,12 +94,43 @@ class SentenceTransformersEmbedder(Embedding):
                 ],
             ),
         }
+        # Loaded models and their batchers, kept resident for the lifetime of the process
+        self.models: dict[str, SentenceTransformer] = {}
+        self.batchers: dict[str, MicroBatcher] = {}
+        self.lock = threading.Lock()
+
+    def load_model(self, model_name: str) -> "SentenceTransformer":
+        with self.lock:
+            if model_name not in self.models:
+                msg.info(f"Loading SentenceTransformer model {model_name}")
+                self.models[model_name] = SentenceTransformer(model_name)
+            return self.models[model_name]
+
+    async def get_batcher(self, model_name: str) -> MicroBatcher:
+        if model_name not in self.batchers:
+            model = await asyncio.to_thread(self.load_model, model_name)
+            self.batchers.setdefault(
+                model_name,
+                MicroBatcher(
+                    lambda content: model.encode(content).tolist(),
+                    max_batch_size=int(
+                        os.getenv("SENTENCE_TRANSFORMERS_BATCH_SIZE", 256)
+                    ),
+                ),
+            )
+        return self.batchers[model_name]
+
+    async def warm_up(self):
+        if SentenceTransformer is None:
+            return
+        for model_name in os.getenv("SENTENCE_TRANSFORMERS_WARMUP", "").split(","):
+            if model_name:
+                await self.get_batcher(model_name)
 
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
         try:
             model_name = config.get("Model").value
-            model = SentenceTransformer(model_name)
-            embeddings = model.encode(content).tolist()
-            return embeddings
+            batcher = await self.get_batcher(model_name)
+            return await batcher.submit(content)
         except Exception as e:
             raise Exception(f"Failed to vectorize chunks: {str(e)}")
@@ -1,9 +1,9 @@
 import os
 import requests
 from wasabi import msg
-import aiohttp
 
 from goldenverba.components.interfaces import Embedding
+from goldenverba.components.sessions import get_http_session
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
 
@@ -64,11 +64,11 @@ class WeaviateEmbedder(Embedding):
 
         data = {"is_search_query": False, "texts": content}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                base_url + path, json=data, headers={"Authorization": f"{api_key}"}
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings = data.get("embeddings", [])
-                return embeddings
+        session = get_http_session(base_url)
+        async with session.post(
+            base_url + path, json=data, headers={"Authorization": f"{api_key}"}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            embeddings = data.get("embeddings", [])
+            return embeddings
@@ -80,6 +80,10 @@ class Embedding(VerbaComponent):
     def __init__(self):
         super().__init__()
         self.max_batch_size = 128
+        # Request budget used by the EmbeddingScheduler, 0 disables the limit
+        self.max_concurrent_requests = int(os.getenv("VERBA_EMBED_MAX_REQUESTS", 4))
+        self.requests_per_minute = int(os.getenv("VERBA_EMBED_REQUESTS_PER_MINUTE", 0))
+        self.tokens_per_minute = int(os.getenv("VERBA_EMBED_TOKENS_PER_MINUTE", 0))
 
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
         """Embed verba documents and its chunks to Weaviate
@@ -89,6 +93,10 @@ class Embedding(VerbaComponent):
         """
         raise NotImplementedError("embed method must be implemented by a subclass.")
 
+    async def warm_up(self):
+        """(Optional) Prepare the Embedder at startup, e.g. load local models into memory"""
+        pass
+
 
 class Chunker(VerbaComponent):
     """
@@ -98,6 +106,8 @@ class Chunker(VerbaComponent):
     def __init__(self):
         super().__init__()
         self.config = {}
+        # Chunkers that split the spaCy Doc of a document, these are processed in batches on import
+        self.requires_spacy = False
 
     async def chunk(
         self,
@@ -140,10 +150,15 @@ class Retriever(VerbaComponent):
         embedder,
         labels,
         document_uuids,
+        max_tokens=None,
     ):
 
         raise NotImplementedError("retrieve method must be implemented by a subclass.")
 
+    def requires_vector(self, config) -> bool:
+        """Whether retrieve needs the query vector, the query is not embedded otherwise"""
+        return True
+
 
 class Generator(VerbaComponent):
     """
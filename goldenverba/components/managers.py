@@ -7,17 +7,30 @@ from weaviate.classes.query import Filter, Sort, MetadataQuery
 from weaviate.collections.classes.data import DataObject
 from weaviate.classes.aggregate import GroupByAggregate
 from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from weaviate.util import generate_uuid5
 
 import os
 import asyncio
 import json
 import re
-from datetime import datetime
-
-from sklearn.decomposition import PCA
-
-
-from goldenverba.components.document import Document
+import time
+import itertools
+import weakref
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+import numpy as np
+
+
+from goldenverba.components.document import Document, process_spacy_docs
+from goldenverba.components.chunk import Chunk
+from goldenverba.components.scheduler import EmbeddingScheduler
+from goldenverba.components.cache import LRUCache, hash_content
+from goldenverba.components.statistics import CorpusStatistics
+from goldenverba.components.suggestions import SuggestionIndex
+from goldenverba.components.projection import Projection, sample_vector_groups
 from goldenverba.components.interfaces import (
     Reader,
     Chunker,
@@ -158,12 +171,113 @@ else:
 ### ----------------------- ###
 
 
+def apply_change(statistics: CorpusStatistics, change: tuple):
+    """Apply a change recorded by WeaviateManager.apply_statistics_change"""
+    if change[0] == "add":
+        statistics.add_document(*change[1:])
+    else:
+        statistics.remove_document(change[1])
+
+
+def log_reconcile_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        msg.warn(f"Failed to reconcile corpus statistics: {str(task.exception())}")
+
+
+def get_embedder_from_meta(meta: str) -> str:
+    """Read the embedding model from the pipeline config stored on a document"""
+    return json.loads(meta)["Embedder"]["config"]["Model"]["value"]
+
+
 class WeaviateManager:
     def __init__(self):
         self.document_collection_name = "VERBA_DOCUMENTS"
         self.config_collection_name = "VERBA_CONFIGURATION"
         self.suggestion_collection_name = "VERBA_SUGGESTIONS"
+        self.projection_collection_name = "VERBA_PROJECTIONS"
         self.embedding_table = {}
+        self.cache_table = {}
+        self.insert_batch_size = int(os.getenv("VERBA_INSERT_BATCH_SIZE", 500))
+        self.collection_registry: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, set[str]
+        ] = weakref.WeakKeyDictionary()
+        self.collection_lock = asyncio.Lock()
+        self.document_cache = LRUCache(
+            int(os.getenv("VERBA_DOCUMENT_CACHE_SIZE", 1000))
+        )
+        self.projections: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, dict[str, Projection]
+        ] = weakref.WeakKeyDictionary()
+        self.projection_locks: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, dict[str, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+        # Version of the stored projection and when it was saved, per client and embedder
+        self.projection_saves: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, dict[str, tuple[int, float]]
+        ] = weakref.WeakKeyDictionary()
+        self.projection_sample_size = int(
+            os.getenv("VERBA_PROJECTION_SAMPLE_SIZE", 5000)
+        )
+        self.projection_save_interval = float(
+            os.getenv("VERBA_PROJECTION_SAVE_INTERVAL", 30)
+        )
+        self.property_registry: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, set[str]
+        ] = weakref.WeakKeyDictionary()
+        self.statistics: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, CorpusStatistics
+        ] = weakref.WeakKeyDictionary()
+        self.statistics_tasks: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, asyncio.Task
+        ] = weakref.WeakKeyDictionary()
+        # Imports and deletes during a reconcile, applied to the rebuilt statistics
+        self.statistics_changes: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, list[tuple]
+        ] = weakref.WeakKeyDictionary()
+        self.statistics_interval = float(
+            os.getenv("VERBA_STATISTICS_RECONCILE_INTERVAL", 600)
+        )
+        self.suggestion_indexes: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, SuggestionIndex
+        ] = weakref.WeakKeyDictionary()
+        self.suggestion_lock = asyncio.Lock()
+        # Write-behind queue of searched queries, flushed in batches by flush_suggestions
+        self.pending_suggestions: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, dict[str, str]
+        ] = weakref.WeakKeyDictionary()
+        self.suggestion_tasks: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, asyncio.Task
+        ] = weakref.WeakKeyDictionary()
+        self.suggestion_flush_interval = float(
+            os.getenv("VERBA_SUGGESTION_FLUSH_INTERVAL", 2)
+        )
+        self.suggestion_batch_size = int(os.getenv("VERBA_SUGGESTION_BATCH_SIZE", 100))
+        self.backfill_tasks: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, asyncio.Task
+        ] = weakref.WeakKeyDictionary()
+        self.backfill_batch_size = 16
+        # Failed flushes of a query, it's dropped after suggestion_max_retries
+        self.suggestion_retries: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, dict[str, int]
+        ] = weakref.WeakKeyDictionary()
+        self.suggestion_max_retries = 3
+        # Version of the documents shared by all Verba processes through VERBA_CONFIGURATION,
+        # with the time it was read and a process-wide id of the client
+        self.corpus_version_uuid = generate_uuid5("VERBA_CORPUS_VERSION")
+        self.corpus_versions: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, tuple[str, float]
+        ] = weakref.WeakKeyDictionary()
+        self.corpus_version_ttl = float(os.getenv("VERBA_CORPUS_VERSION_TTL", 2))
+        self.client_ids: weakref.WeakKeyDictionary[WeaviateAsyncClient, int] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.client_id_counter = itertools.count(1)
+        self.metadata_cache: weakref.WeakKeyDictionary[
+            WeaviateAsyncClient, tuple[float, tuple[dict, dict]]
+        ] = weakref.WeakKeyDictionary()
+        self.metadata_ttl = float(os.getenv("VERBA_METADATA_CACHE_TTL", 10))
+        self.metadata_concurrency = int(os.getenv("VERBA_METADATA_CONCURRENCY", 8))
+        self.metadata_timeout = float(os.getenv("VERBA_METADATA_TIMEOUT", 5))
 
     ### Connection Handling
 
@@ -260,6 +374,13 @@ class WeaviateManager:
 
     async def disconnect(self, client: WeaviateAsyncClient):
         try:
+            await self.flush_suggestions(client)
+            # Don't retry failed suggestions on a closed client, this also cancels a delayed flush that is still sleeping
+            self.clear_pending_suggestions(client)
+            backfill = self.backfill_tasks.pop(client, None)
+            if backfill is not None:
+                backfill.cancel()
+            await self.save_projections(client)
             await client.close()
             return True
         except Exception as e:
@@ -268,10 +389,19 @@ class WeaviateManager:
 
     ### Metadata
 
-    async def get_metadata(self, client: WeaviateAsyncClient):
+    async def get_metadata(self, client: WeaviateAsyncClient, partial: bool = True):
+        """Node and collection information, cached for VERBA_METADATA_CACHE_TTL seconds
+        @parameter: partial : bool - Report collections whose count timed out with a count of None instead of failing
+        """
+        cached = self.metadata_cache.get(client)
+        if cached is not None and time.monotonic() - cached[0] < self.metadata_ttl:
+            return cached[1]
+
+        nodes, collections = await asyncio.gather(
+            client.cluster.nodes(output="verbose"), client.collections.list_all()
+        )
 
         # Node Information
-        nodes = await client.cluster.nodes(output="verbose")
         node_payload = {"node_count": 0, "weaviate_version": "", "nodes": []}
         for node in nodes:
             node_payload["nodes"].append(
@@ -286,53 +416,228 @@ class WeaviateManager:
         node_payload["weaviate_version"] = nodes[0].version
 
         # Collection Information
+        semaphore = asyncio.Semaphore(self.metadata_concurrency)
+
+        async def count_objects(collection_name: str) -> int | None:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        client.collections.get(collection_name).length(),
+                        timeout=self.metadata_timeout,
+                    )
+                except Exception as e:
+                    if not partial:
+                        raise
+                    msg.warn(f"Couldn't count objects of {collection_name}: {str(e)}")
+                    return None
+
+        counts = await asyncio.gather(
+            *[count_objects(collection_name) for collection_name in collections]
+        )
+        collection_payload = {
+            "collection_count": len(collections),
+            "collections": [
+                {"name": collection_name, "count": count}
+                for collection_name, count in zip(collections, counts)
+            ],
+            "partial": any(count is None for count in counts),
+        }
+        collection_payload["collections"].sort(
+            key=lambda x: x["count"] if x["count"] is not None else -1, reverse=True
+        )
 
-        collections = await client.collections.list_all()
-        collection_payload = {"collection_count": 0, "collections": []}
-        for collection_name in collections:
-            collection_objects = await client.collections.get(collection_name).length()
-            collection_payload["collections"].append(
-                {"name": collection_name, "count": collection_objects}
+        # Partial results are not cached, the next request retries the slow collections
+        if not collection_payload["partial"]:
+            self.metadata_cache[client] = (
+                time.monotonic(),
+                (node_payload, collection_payload),
             )
-        collection_payload["collections"].sort(key=lambda x: x["count"], reverse=True)
-        collection_payload["collection_count"] = len(collections)
-
         return node_payload, collection_payload
 
     ### Collection Handling
 
+    async def read_corpus_version(self, client: WeaviateAsyncClient) -> str:
+        # Not through verify_collection, the registry itself depends on the version
+        try:
+            config_collection = client.collections.get(self.config_collection_name)
+            stored = await config_collection.query.fetch_object_by_id(
+                self.corpus_version_uuid
+            )
+        except Exception:
+            # e.g. the collections were dropped by another process
+            return ""
+        if stored is None:
+            return ""
+        return json.loads(stored.properties["config"])["corpus_version"]
+
+    async def get_corpus_version(self, client: WeaviateAsyncClient) -> str:
+        """Version of the documents of a client, read from Weaviate at most every VERBA_CORPUS_VERSION_TTL seconds.
+        Imports and deletes of other processes change it, which invalidates the caches of this process
+        """
+        if client not in self.client_ids:
+            self.client_ids[client] = next(self.client_id_counter)
+        cached = self.corpus_versions.get(client)
+        if cached is None or time.monotonic() - cached[1] >= self.corpus_version_ttl:
+            version = await self.read_corpus_version(client)
+            if cached is not None and cached[0] != version:
+                self.invalidate_caches(client)
+            cached = (version, time.monotonic())
+            self.corpus_versions[client] = cached
+        return f"{self.client_ids[client]}:{cached[0]}"
+
+    async def bump_corpus_version(self, client: WeaviateAsyncClient):
+        """Called whenever documents are imported or deleted"""
+        version = uuid4().hex
+        self.corpus_versions[client] = (version, time.monotonic())
+        try:
+            if await self.verify_collection(client, self.config_collection_name):
+                config_collection = client.collections.get(self.config_collection_name)
+                properties = {"config": json.dumps({"corpus_version": version})}
+                try:
+                    await config_collection.data.replace(
+                        uuid=self.corpus_version_uuid, properties=properties
+                    )
+                except Exception:
+                    # Only the first import of a cluster creates the object
+                    await config_collection.data.insert(
+                        properties=properties, uuid=self.corpus_version_uuid
+                    )
+        except Exception as e:
+            msg.warn(f"Couldn't store the corpus version: {str(e)}")
+
+    def invalidate_caches(self, client: WeaviateAsyncClient):
+        """Drop what this process knows about the collections and documents of a client"""
+        self.invalidate_collections(client)
+        self.invalidate_statistics(client)
+        self.document_cache.clear()
+        self.metadata_cache.pop(client, None)
+
+    async def get_collection_registry(self, client: WeaviateAsyncClient) -> set[str]:
+        """Names of the collections known to exist for a client, fetched once per client"""
+        # Collections dropped or created by other processes invalidate the registry
+        await self.get_corpus_version(client)
+        registry = self.collection_registry.get(client)
+        if registry is None:
+            registry = set(await client.collections.list_all(simple=True))
+            self.collection_registry[client] = registry
+        return registry
+
+    def invalidate_collections(self, client: WeaviateAsyncClient):
+        self.collection_registry.pop(client, None)
+        self.property_registry.pop(client, None)
+
     async def verify_collection(
-        self, client: WeaviateAsyncClient, collection_name: str
+        self,
+        client: WeaviateAsyncClient,
+        collection_name: str,
+        properties: list[Property] | None = None,
+        **config,
     ):
-        if not await client.collections.exists(collection_name):
-            msg.info(
-                f"Collection: {collection_name} does not exist, creating new collection."
-            )
-            returned_collection = await client.collections.create(name=collection_name)
-            if returned_collection:
+        """Make sure a collection exists, missing collections are created with the given properties and config"""
+        registry = await self.get_collection_registry(client)
+        if collection_name in registry:
+            return True
+
+        async with self.collection_lock:
+            if collection_name in registry:
                 return True
-            else:
-                return False
-        else:
+            if not await client.collections.exists(collection_name):
+                msg.info(
+                    f"Collection: {collection_name} does not exist, creating new collection."
+                )
+                returned_collection = await client.collections.create(
+                    name=collection_name, properties=properties, **config
+                )
+                if not returned_collection:
+                    return False
+            registry.add(collection_name)
+            return True
+
+    async def verify_properties(
+        self,
+        client: WeaviateAsyncClient,
+        collection_name: str,
+        properties: list[Property],
+    ):
+        """Add properties that are missing on an existing collection, checked once per client. Returns the names of the added properties"""
+        verified = self.property_registry.setdefault(client, set())
+        if collection_name in verified:
+            return []
+        collection = client.collections.get(collection_name)
+        collection_config = await collection.config.get()
+        existing = {prop.name for prop in collection_config.properties}
+        added = []
+        for prop in properties:
+            if prop.name not in existing:
+                await collection.config.add_property(prop)
+                added.append(prop.name)
+        verified.add(collection_name)
+        return added
+
+    async def verify_document_collection(self, client: WeaviateAsyncClient):
+        properties = [
+            Property(
+                name="embedder",
+                data_type=DataType.TEXT,
+                tokenization=Tokenization.FIELD,
+            ),
+            # Exact title, the title itself is word tokenized for search
+            Property(
+                name="title_key",
+                data_type=DataType.TEXT,
+                tokenization=Tokenization.FIELD,
+                index_searchable=False,
+            ),
+        ]
+        if await self.verify_collection(
+            client, self.document_collection_name, properties=properties
+        ):
+            added = await self.verify_properties(
+                client, self.document_collection_name, properties
+            )
+            if added:
+                # Documents imported before these were properties, migrated without blocking the request
+                self.backfill_tasks[client] = asyncio.create_task(
+                    self.backfill_document_properties(client)
+                )
             return True
+        return False
 
     async def verify_embedding_collection(self, client: WeaviateAsyncClient, embedder):
         if embedder not in self.embedding_table:
             self.embedding_table[embedder] = "VERBA_Embedding_" + re.sub(
                 r"[^a-zA-Z0-9]", "_", embedder
             )
-            return await self.verify_collection(client, self.embedding_table[embedder])
-        else:
+        properties = [Property(name="pca_version", data_type=DataType.INT)]
+        if await self.verify_collection(
+            client, self.embedding_table[embedder], properties=properties
+        ):
+            await self.verify_properties(
+                client, self.embedding_table[embedder], properties
+            )
             return True
+        return False
 
     async def verify_cache_collection(self, client: WeaviateAsyncClient, embedder):
-        if embedder not in self.embedding_table:
-            self.embedding_table[embedder] = "VERBA_Cache_" + re.sub(
+        if embedder not in self.cache_table:
+            self.cache_table[embedder] = "VERBA_Cache_" + re.sub(
                 r"[^a-zA-Z0-9]", "_", embedder
             )
-            return await self.verify_collection(client, self.embedding_table[embedder])
-        else:
-            return True
+        # Vectors are only read by hash, a flat index avoids indexing them a second time with HNSW
+        return await self.verify_collection(
+            client,
+            self.cache_table[embedder],
+            properties=[
+                Property(
+                    name="hash",
+                    data_type=DataType.TEXT,
+                    tokenization=Tokenization.FIELD,
+                    index_searchable=False,
+                )
+            ],
+            vectorizer_config=Configure.Vectorizer.none(),
+            vector_index_config=Configure.VectorIndex.flat(),
+        )
 
     async def verify_embedding_collections(
         self, client: WeaviateAsyncClient, environment_variables, libraries
@@ -340,18 +645,16 @@ class WeaviateManager:
         for embedder in embedders:
             if embedder.check_available(environment_variables, libraries):
                 if "Model" in embedder.config:
+                    # Only register the names, collections are created on the first import
                     for _embedder in embedder.config["Model"].values:
                         self.embedding_table[_embedder] = "VERBA_Embedding_" + re.sub(
                             r"[^a-zA-Z0-9]", "_", _embedder
                         )
-                        await self.verify_collection(
-                            client, self.embedding_table[_embedder]
-                        )
 
     async def verify_collections(
         self, client: WeaviateAsyncClient, environment_variables, libraries
     ):
-        await self.verify_collection(client, self.document_collection_name)
+        await self.verify_document_collection(client)
         await self.verify_collection(client, self.suggestion_collection_name)
         await self.verify_collection(client, self.config_collection_name)
         await self.verify_embedding_collections(
@@ -394,102 +697,312 @@ class WeaviateManager:
     async def import_document(
         self, client: WeaviateAsyncClient, document: Document, embedder: str
     ):
-        if await self.verify_collection(
-            client, self.document_collection_name
+        if await self.verify_document_collection(
+            client
         ) and await self.verify_embedding_collection(client, embedder):
             document_collection = client.collections.get(self.document_collection_name)
             embedder_collection = client.collections.get(self.embedding_table[embedder])
 
             ### Import Document
             document_obj = Document.to_json(document)
+            document_obj["embedder"] = embedder
+            document_obj["title_key"] = document.title
             doc_uuid = await document_collection.data.insert(document_obj)
 
-            chunk_ids = []
-
             try:
-                for chunk in document.chunks:
-                    chunk.doc_uuid = doc_uuid
-                    chunk.labels = document.labels
-                    chunk.title = document.title
-
-                chunk_response = await embedder_collection.data.insert_many(
-                    [
-                        DataObject(properties=chunk.to_json(), vector=chunk.vector)
-                        for chunk in document.chunks
-                    ]
-                )
-                chunk_ids = [
-                    chunk_response.uuids[uuid] for uuid in chunk_response.uuids
-                ]
+                await self.project_chunks(client, embedder, document.chunks)
+
+                imported = 0
+                for start in range(0, len(document.chunks), self.insert_batch_size):
+                    batch = document.chunks[start : start + self.insert_batch_size]
+                    objects = []
+                    for chunk in batch:
+                        chunk.doc_uuid = doc_uuid
+                        chunk.labels = document.labels
+                        chunk.title = document.title
+                        objects.append(
+                            DataObject(properties=chunk.to_json(), vector=chunk.vector)
+                        )
 
-                if chunk_response.has_errors:
-                    raise Exception(
-                        f"Failed to ingest chunks into Weaviate: {chunk_response.errors}"
-                    )
+                    chunk_response = await embedder_collection.data.insert_many(objects)
+                    imported += len(chunk_response.uuids)
 
-                if doc_uuid and chunk_response:
-                    response = await embedder_collection.aggregate.over_all(
-                        filters=Filter.by_property("doc_uuid").equal(doc_uuid),
-                        total_count=True,
-                    )
-                    if response.total_count != len(document.chunks):
-                        await document_collection.data.delete_by_id(doc_uuid)
-                        for _id in chunk_ids:
-                            await embedder_collection.data.delete_by_id(_id)
+                    if chunk_response.has_errors:
+                        errors = {
+                            start + index: error.message
+                            for index, error in chunk_response.errors.items()
+                        }
                         raise Exception(
-                            f"Chunk Mismatch detected after importing: Imported:{response.total_count} | Existing: {len(document.chunks)}"
+                            f"Failed to ingest {len(errors)} of {len(batch)} chunks into Weaviate: {errors}"
                         )
 
+                if imported != len(document.chunks):
+                    raise Exception(
+                        f"Chunk Mismatch detected after importing: Imported:{imported} | Existing: {len(document.chunks)}"
+                    )
+
+                self.record_document_added(
+                    client, doc_uuid, document.labels, embedder, len(document.chunks)
+                )
+                await self.bump_corpus_version(client)
+
             except Exception as e:
-                if doc_uuid:
-                    await self.delete_document(client, doc_uuid)
+                await self.delete_chunks(embedder_collection, doc_uuid)
+                await document_collection.data.delete_by_id(doc_uuid)
+                await self.bump_corpus_version(client)
                 raise Exception(f"Chunk import failed with : {str(e)}")
 
-    ### Document CRUD
+    ### Projection Handling
+
+    async def verify_projection_collection(self, client: WeaviateAsyncClient):
+        return await self.verify_collection(
+            client,
+            self.projection_collection_name,
+            properties=[
+                Property(
+                    name="embedder",
+                    data_type=DataType.TEXT,
+                    tokenization=Tokenization.FIELD,
+                ),
+                Property(
+                    name="projection",
+                    data_type=DataType.TEXT,
+                    index_filterable=False,
+                    index_searchable=False,
+                ),
+            ],
+        )
 
-    async def exist_document_name(self, client: WeaviateAsyncClient, name: str) -> str:
-        if await self.verify_collection(client, self.document_collection_name):
-            document_collection = client.collections.get(self.document_collection_name)
-            aggregation = await document_collection.aggregate.over_all(total_count=True)
+    def get_projection_lock(
+        self, client: WeaviateAsyncClient, embedder: str
+    ) -> asyncio.Lock:
+        locks = self.projection_locks.setdefault(client, {})
+        if embedder not in locks:
+            locks[embedder] = asyncio.Lock()
+        return locks[embedder]
+
+    async def get_projection(
+        self, client: WeaviateAsyncClient, embedder: str
+    ) -> Projection:
+        """Projection shared by all chunks of an embedding collection, loaded once per client"""
+        projections = self.projections.setdefault(client, {})
+        if embedder in projections:
+            return projections[embedder]
+        async with self.get_projection_lock(client, embedder):
+            if embedder not in projections:
+                projection = Projection(self.projection_sample_size)
+                if await self.verify_projection_collection(client):
+                    projection_collection = client.collections.get(
+                        self.projection_collection_name
+                    )
+                    stored = await projection_collection.query.fetch_object_by_id(
+                        generate_uuid5(embedder)
+                    )
+                    if stored is not None:
+                        projection = Projection.from_json(
+                            json.loads(stored.properties["projection"]),
+                            self.projection_sample_size,
+                        )
+                self.projection_saves.setdefault(client, {})[embedder] = (
+                    projection.version,
+                    time.monotonic(),
+                )
+                projections[embedder] = projection
+        return projections[embedder]
 
-            if aggregation.total_count == 0:
-                return None
+    async def save_projection(
+        self, client: WeaviateAsyncClient, embedder: str, projection: Projection
+    ):
+        if await self.verify_projection_collection(client):
+            projection_collection = client.collections.get(
+                self.projection_collection_name
+            )
+            uuid = generate_uuid5(embedder)
+            properties = {
+                "embedder": embedder,
+                "projection": json.dumps(projection.to_json()),
+            }
+            if await projection_collection.data.exists(uuid):
+                await projection_collection.data.replace(
+                    uuid=uuid, properties=properties
+                )
             else:
-                documents = await document_collection.query.fetch_objects(
-                    filters=Filter.by_property("title").equal(name)
+                await projection_collection.data.insert(
+                    properties=properties, uuid=uuid
                 )
-                if len(documents.objects) > 0:
-                    return documents.objects[0].uuid
+            self.projection_saves.setdefault(client, {})[embedder] = (
+                projection.version,
+                time.monotonic(),
+            )
 
-            return None
+    async def save_projections(self, client: WeaviateAsyncClient, force: bool = True):
+        """Store projections that changed since they were saved.
+        Without force only once they are frozen or VERBA_PROJECTION_SAVE_INTERVAL seconds passed
+        """
+        saves = self.projection_saves.get(client, {})
+        for embedder, projection in list(self.projections.get(client, {}).items()):
+            version, saved_at = saves.get(embedder, (0, 0))
+            if version == projection.version:
+                continue
+            if (
+                force
+                or projection.frozen
+                or time.monotonic() - saved_at >= self.projection_save_interval
+            ):
+                try:
+                    await self.save_projection(client, embedder, projection)
+                except Exception as e:
+                    msg.warn(f"Failed to store the projection of {embedder}: {str(e)}")
+
+    async def project_chunks(
+        self, client: WeaviateAsyncClient, embedder: str, chunks: list[Chunk]
+    ):
+        """Update the projection of the embedding collection with the chunks and store their 3D coordinates"""
+        if not chunks:
+            return
+        projection = await self.get_projection(client, embedder)
+        vectors = [chunk.vector for chunk in chunks]
+        if projection.frozen:
+            coordinates = await asyncio.to_thread(projection.transform, vectors)
+            version = projection.version
+        else:
+            async with self.get_projection_lock(client, embedder):
+                coordinates = await asyncio.to_thread(projection.fit_transform, vectors)
+                version = projection.version
+            await self.save_projections(client, force=False)
+        for chunk, pca in zip(chunks, coordinates):
+            chunk.pca = pca
+            chunk.pca_version = version
+
+    async def get_chunk_coordinates(
+        self, client: WeaviateAsyncClient, embedder: str, items: list
+    ) -> dict[str, list[float]]:
+        """3D coordinates of chunks by uuid, chunks projected with an older version of the projection are projected again"""
+        projection = await self.get_projection(client, embedder)
+        coordinates = {}
+        stale = []
+        for item in items:
+            pca = item.properties.get("pca")
+            if pca is not None and item.properties.get("pca_version") == (
+                projection.version
+            ):
+                coordinates[str(item.uuid)] = pca
+            else:
+                stale.append(item)
+
+        vectors = {
+            str(item.uuid): item.vector["default"] for item in stale if item.vector
+        }
+        missing = [item.uuid for item in stale if not item.vector]
+        if missing:
+            embedder_collection = client.collections.get(self.embedding_table[embedder])
+            batch_size = 250
+            for i in range(0, len(missing), batch_size):
+                batch = missing[i : i + batch_size]
+                chunks = await embedder_collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(batch),
+                    limit=len(batch),
+                    return_properties=[],
+                    include_vector=True,
+                )
+                for chunk in chunks.objects:
+                    vectors[str(chunk.uuid)] = chunk.vector["default"]
+
+        if vectors:
+            projected = await asyncio.to_thread(
+                projection.transform, list(vectors.values())
+            )
+            coordinates.update(zip(vectors.keys(), projected))
+        return coordinates
+
+    ### Document CRUD
+
+    async def exist_document_name(self, client: WeaviateAsyncClient, name: str) -> str:
+        duplicates = await self.exist_document_names(client, [name])
+        return duplicates.get(name)
+
+    async def exist_document_names(
+        self, client: WeaviateAsyncClient, names: list[str]
+    ) -> dict[str, str]:
+        """Resolve document titles to the uuids of existing documents with one query per batch, returns only the titles that exist"""
+        duplicates = {}
+        names = list(dict.fromkeys(names))
+        if names and await self.verify_document_collection(client):
+            document_collection = client.collections.get(self.document_collection_name)
+            batch_size = 500
+            for i in range(0, len(names), batch_size):
+                batch = names[i : i + batch_size]
+                # title_key is field tokenized, so only exact titles match
+                offset = 0
+                while True:
+                    response = await document_collection.query.fetch_objects(
+                        filters=Filter.by_property("title_key").contains_any(batch),
+                        limit=batch_size,
+                        offset=offset,
+                        return_properties=["title_key"],
+                    )
+                    for item in response.objects:
+                        duplicates.setdefault(item.properties["title_key"], item.uuid)
+                    if len(response.objects) < batch_size:
+                        break
+                    offset += batch_size
+        return duplicates
 
     async def delete_document(self, client: WeaviateAsyncClient, uuid: str):
-        if await self.verify_collection(client, self.document_collection_name):
+        if await self.verify_document_collection(client):
             document_collection = client.collections.get(self.document_collection_name)
 
-            if not await document_collection.data.exists(uuid):
+            embedder = await self.get_document_embedder(client, uuid)
+            if embedder is None:
                 return
 
-            document_obj = await document_collection.query.fetch_object_by_id(uuid)
-            embedding_config = json.loads(document_obj.properties.get("meta"))[
-                "Embedder"
-            ]
-            embedder = embedding_config["config"]["Model"]["value"]
-
+            self.document_cache.invalidate(str(uuid))
             if await self.verify_embedding_collection(client, embedder):
                 if await document_collection.data.delete_by_id(uuid):
                     embedder_collection = client.collections.get(
                         self.embedding_table[embedder]
                     )
-                    await embedder_collection.data.delete_many(
-                        where=Filter.by_property("doc_uuid").equal(uuid)
-                    )
+                    await self.delete_chunks(embedder_collection, uuid)
+                    self.record_document_removed(client, uuid)
+                    await self.bump_corpus_version(client)
 
-    async def delete_all_documents(self, client: WeaviateAsyncClient):
-        if await self.verify_collection(client, self.document_collection_name):
-            document_collection = client.collections.get(self.document_collection_name)
-            async for item in document_collection.iterator():
-                await self.delete_document(client, item.uuid)
+    async def delete_chunks(self, embedder_collection, doc_uuid: str) -> int:
+        """Delete all chunks of a document, returns how many were deleted.
+        delete_many removes at most QUERY_MAXIMUM_RESULTS objects per call, so it's repeated until nothing matches
+        """
+        deleted = 0
+        while True:
+            response = await embedder_collection.data.delete_many(
+                where=Filter.by_property("doc_uuid").equal(doc_uuid)
+            )
+            deleted += response.successful
+            if response.matches == 0:
+                return deleted
+            if response.successful == 0:
+                msg.warn(
+                    f"Couldn't delete {response.matches} chunks of document {doc_uuid}"
+                )
+                return deleted
+
+    async def delete_all_documents(
+        self,
+        client: WeaviateAsyncClient,
+        progress: Callable[[int, int], Awaitable] | None = None,
+    ):
+        """Drop the document collection and all embedding collections, they only hold chunks of documents.
+        Collections are recreated on the next import"""
+        collections = await client.collections.list_all(simple=True)
+        await self.delete_collections(
+            client,
+            [
+                name
+                for name in collections
+                if name
+                in [self.document_collection_name, self.projection_collection_name]
+                or name.startswith("VERBA_Embedding_")
+            ],
+            progress,
+        )
 
     async def delete_all_configs(self, client: WeaviateAsyncClient):
         if await self.verify_collection(client, self.config_collection_name):
@@ -497,11 +1010,40 @@ class WeaviateManager:
             async for item in config_collection.iterator():
                 await config_collection.data.delete_by_id(item.uuid)
 
-    async def delete_all(self, client: WeaviateAsyncClient):
-        node_payload, collection_payload = await self.get_metadata(client)
-        for collection in collection_payload["collections"]:
-            if "VERBA" in collection["name"]:
-                await client.collections.delete(collection["name"])
+    async def delete_all(
+        self,
+        client: WeaviateAsyncClient,
+        progress: Callable[[int, int], Awaitable] | None = None,
+    ):
+        collections = await client.collections.list_all(simple=True)
+        await self.delete_collections(
+            client, [name for name in collections if "VERBA" in name], progress
+        )
+        self.cache_table = {}
+
+    async def delete_collections(
+        self,
+        client: WeaviateAsyncClient,
+        collection_names: list[str],
+        progress: Callable[[int, int], Awaitable] | None = None,
+    ):
+        try:
+            for index, collection_name in enumerate(collection_names):
+                msg.info(f"Deleting collection {collection_name}")
+                await client.collections.delete(collection_name)
+                if progress is not None:
+                    await progress(index + 1, len(collection_names))
+        finally:
+            self.invalidate_collections(client)
+            self.document_cache.clear()
+            self.projections.pop(client, None)
+            self.projection_saves.pop(client, None)
+            self.invalidate_statistics(client)
+            self.metadata_cache.pop(client, None)
+            if self.suggestion_collection_name in collection_names:
+                self.suggestion_indexes.pop(client, None)
+                self.clear_pending_suggestions(client)
+            await self.bump_corpus_version(client)
 
     async def get_documents(
         self,
@@ -512,7 +1054,7 @@ class WeaviateManager:
         labels: list[str],
         properties: list[str] = None,
     ) -> list[dict]:
-        if await self.verify_collection(client, self.document_collection_name):
+        if await self.verify_document_collection(client):
             offset = pageSize * (page - 1)
             document_collection = client.collections.get(self.document_collection_name)
 
@@ -521,17 +1063,13 @@ class WeaviateManager:
             else:
                 filter = None
 
-            response = await document_collection.aggregate.over_all(
-                total_count=True, filters=filter
-            )
+            statistics = await self.get_statistics(client)
+            total_count = statistics.get_document_count(labels=labels)
 
-            if response.total_count == 0:
+            if total_count == 0:
                 return [], 0
 
-            total_count = response.total_count
-
             if query == "":
-                total_count = response.total_count
                 response = await document_collection.query.fetch_objects(
                     limit=pageSize,
                     offset=offset,
@@ -560,7 +1098,7 @@ class WeaviateManager:
     async def get_document(
         self, client: WeaviateAsyncClient, uuid: str, properties: list[str] = None
     ) -> list[dict]:
-        if await self.verify_collection(client, self.document_collection_name):
+        if await self.verify_document_collection(client):
             document_collection = client.collections.get(self.document_collection_name)
 
             if await document_collection.data.exists(uuid):
@@ -572,18 +1110,208 @@ class WeaviateManager:
                 msg.warn(f"Document not found ({uuid})")
                 return None
 
+    async def get_documents_by_ids(
+        self,
+        client: WeaviateAsyncClient,
+        uuids: list[str],
+        properties: list[str] = None,
+    ) -> dict[str, dict]:
+        """Fetch the properties of many documents at once, returns only the documents that were found"""
+        properties = properties or ["title", "metadata"]
+        documents = {}
+        missing = []
+        for uuid in dict.fromkeys(str(uuid) for uuid in uuids):
+            cached = self.document_cache.get(uuid)
+            if cached is not None and all(prop in cached for prop in properties):
+                documents[uuid] = {prop: cached[prop] for prop in properties}
+            else:
+                missing.append(uuid)
+
+        if missing and await self.verify_document_collection(client):
+            document_collection = client.collections.get(self.document_collection_name)
+            batch_size = 500
+            for i in range(0, len(missing), batch_size):
+                batch = missing[i : i + batch_size]
+                response = await document_collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(batch),
+                    limit=len(batch),
+                    return_properties=properties,
+                )
+                for item in response.objects:
+                    uuid = str(item.uuid)
+                    documents[uuid] = item.properties
+                    cached = self.document_cache.get(uuid) or {}
+                    self.document_cache.put(uuid, {**cached, **item.properties})
+        return documents
+
+    async def get_document_embedder(
+        self, client: WeaviateAsyncClient, uuid: str
+    ) -> str:
+        """Embedder of a document, which names the collection of its chunks. None if the document does not exist"""
+        uuid = str(uuid)
+        documents = await self.get_documents_by_ids(client, [uuid], ["embedder"])
+        if documents.get(uuid, {}).get("embedder"):
+            return documents[uuid]["embedder"]
+
+        # Documents imported before the embedder was stored as property
+        document = await self.get_document(client, uuid, properties=["meta"])
+        if document is None:
+            return None
+        embedder = get_embedder_from_meta(document["meta"])
+        document_collection = client.collections.get(self.document_collection_name)
+        await document_collection.data.update(
+            uuid=uuid, properties={"embedder": embedder}
+        )
+        cached = self.document_cache.get(uuid) or {}
+        self.document_cache.put(uuid, {**cached, "embedder": embedder})
+        return embedder
+
+    async def backfill_document_properties(self, client: WeaviateAsyncClient):
+        """Store the embedder and title key on documents imported before they were properties.
+        Embedders missed here are migrated by get_document_embedder
+        """
+        document_collection = client.collections.get(self.document_collection_name)
+        updated = 0
+
+        async def update(uuid, properties: dict):
+            changes = {}
+            if not properties.get("title_key"):
+                changes["title_key"] = properties["title"]
+            if not properties.get("embedder"):
+                try:
+                    changes["embedder"] = get_embedder_from_meta(properties["meta"])
+                except Exception as e:
+                    msg.warn(f"Couldn't read the embedder of document {uuid}: {e}")
+            if not changes:
+                return 0
+            await document_collection.data.update(uuid=uuid, properties=changes)
+            return 1
+
+        try:
+            batch = []
+            async for item in document_collection.iterator(
+                return_properties=["title", "meta", "embedder", "title_key"]
+            ):
+                if item.properties.get("embedder") and item.properties.get("title_key"):
+                    continue
+                batch.append(update(item.uuid, item.properties))
+                if len(batch) >= self.backfill_batch_size:
+                    updated += sum(await asyncio.gather(*batch))
+                    batch = []
+            updated += sum(await asyncio.gather(*batch))
+        except Exception as e:
+            msg.warn(f"Failed to migrate existing documents: {e}")
+        if updated > 0:
+            msg.info(f"Migrated {updated} existing documents")
+
     ### Labels
 
     async def get_labels(self, client: WeaviateAsyncClient) -> list[str]:
-        if await self.verify_collection(client, self.document_collection_name):
-            document_collection = client.collections.get(self.document_collection_name)
-            aggregation = await document_collection.aggregate.over_all(
-                group_by=GroupByAggregate(prop="labels"), total_count=True
-            )
-            return [
-                aggregation_group.grouped_by.value
-                for aggregation_group in aggregation.groups
-            ]
+        statistics = await self.get_statistics(client)
+        return statistics.get_labels()
+
+    async def get_label_counts(self, client: WeaviateAsyncClient) -> dict[str, int]:
+        statistics = await self.get_statistics(client)
+        return statistics.get_label_counts()
+
+    ### Corpus Statistics
+
+    async def get_statistics(self, client: WeaviateAsyncClient) -> CorpusStatistics:
+        """Corpus statistics of a client, built once and reconciled in the background when stale"""
+        # Imports and deletes of other processes drop the statistics
+        await self.get_corpus_version(client)
+        statistics = self.statistics.get(client)
+        if statistics is None:
+            # Concurrent first requests share one scan of the documents
+            return await asyncio.shield(self.start_reconcile(client))
+
+        if statistics.is_stale(self.statistics_interval):
+            self.start_reconcile(client)
+        return statistics
+
+    def start_reconcile(self, client: WeaviateAsyncClient) -> asyncio.Task:
+        """Return the running reconcile of a client, or start one"""
+        task = self.statistics_tasks.get(client)
+        if task is None or task.done():
+            task = asyncio.create_task(self.reconcile_statistics(client))
+            task.add_done_callback(log_reconcile_error)
+            self.statistics_tasks[client] = task
+        return task
+
+    def invalidate_statistics(self, client: WeaviateAsyncClient):
+        """Drop the statistics of a client, a running reconcile no longer stores its result"""
+        self.statistics.pop(client, None)
+        self.statistics_tasks.pop(client, None)
+        self.statistics_changes.pop(client, None)
+
+    def record_document_added(
+        self,
+        client: WeaviateAsyncClient,
+        uuid: str,
+        labels: list[str],
+        embedder: str,
+        chunks: int,
+    ):
+        change = ("add", uuid, labels, embedder, chunks)
+        self.apply_statistics_change(client, change)
+
+    def record_document_removed(self, client: WeaviateAsyncClient, uuid: str):
+        self.apply_statistics_change(client, ("remove", uuid))
+
+    def apply_statistics_change(self, client: WeaviateAsyncClient, change: tuple):
+        statistics = self.statistics.get(client)
+        if statistics is not None:
+            apply_change(statistics, change)
+        changes = self.statistics_changes.get(client)
+        if changes is not None:
+            changes.append(change)
+
+    async def reconcile_statistics(
+        self, client: WeaviateAsyncClient
+    ) -> CorpusStatistics:
+        """Rebuild the corpus statistics from the document and embedding collections"""
+        statistics = CorpusStatistics()
+        changes = []
+        self.statistics_changes[client] = changes
+        try:
+            if await self.verify_document_collection(client):
+                chunk_counts = {}
+                registry = await self.get_collection_registry(client)
+                for collection_name in list(registry):
+                    if not collection_name.startswith("VERBA_Embedding_"):
+                        continue
+                    response = await client.collections.get(
+                        collection_name
+                    ).aggregate.over_all(
+                        group_by=GroupByAggregate(prop="doc_uuid"), total_count=True
+                    )
+                    for group in response.groups:
+                        chunk_counts[str(group.grouped_by.value)] = group.total_count
+
+                document_collection = client.collections.get(
+                    self.document_collection_name
+                )
+                async for item in document_collection.iterator(
+                    return_properties=["labels", "embedder"]
+                ):
+                    statistics.add_document(
+                        item.uuid,
+                        item.properties.get("labels"),
+                        item.properties.get("embedder"),
+                        chunk_counts.get(str(item.uuid), 0),
+                    )
+        finally:
+            # Statistics invalidated during the scan would be stale
+            current = self.statistics_changes.get(client) is changes
+            if current:
+                self.statistics_changes.pop(client)
+
+        # Imports and deletes that happened while scanning
+        for change in changes:
+            apply_change(statistics, change)
+        if current:
+            self.statistics[client] = statistics
+        return statistics
 
     ### Chunks Retrieval
 
@@ -603,17 +1331,14 @@ class WeaviateManager:
         self, client: WeaviateAsyncClient, uuid: str, page: int, pageSize: int
     ) -> list[dict]:
 
-        if await self.verify_collection(client, self.document_collection_name):
+        if await self.verify_document_collection(client):
 
             offset = pageSize * (page - 1)
 
-            document = await self.get_document(client, uuid, properties=["meta"])
-            if document is None:
+            embedder = await self.get_document_embedder(client, uuid)
+            if embedder is None:
                 return []
 
-            embedding_config = json.loads(document.get("meta"))["Embedder"]
-            embedder = embedding_config["config"]["Model"]["value"]
-
             if await self.verify_embedding_collection(client, embedder):
                 embedder_collection = client.collections.get(
                     self.embedding_table[embedder]
@@ -631,16 +1356,22 @@ class WeaviateManager:
                 return chunks
 
     async def get_vectors(
-        self, client: WeaviateAsyncClient, uuid: str, showAll: bool
+        self,
+        client: WeaviateAsyncClient,
+        uuid: str,
+        showAll: bool,
+        max_points: int = 0,
     ) -> dict:
+        """Stored 3D coordinates of the chunks of a document or of its whole embedding collection
+        @parameter: max_points : int - Downsample to at most max_points chunks, 0 returns all chunks
+        """
 
-        document = await self.get_document(client, uuid, properties=["meta", "title"])
-
-        if document is None:
+        embedder = await self.get_document_embedder(client, uuid)
+        if embedder is None:
             return None
-
-        embedding_config = json.loads(document.get("meta"))["Embedder"]
-        embedder = embedding_config["config"]["Model"]["value"]
+        document = (await self.get_documents_by_ids(client, [uuid], ["title"]))[
+            str(uuid)
+        ]
 
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
@@ -658,8 +1389,7 @@ class WeaviateManager:
                         filters=Filter.by_property("doc_uuid").equal(uuid),
                         limit=batch_size,
                         offset=offset,
-                        return_properties=["chunk_id", "pca"],
-                        include_vector=True,
+                        return_properties=["chunk_id", "pca", "pca_version"],
                     )
                     call_end_time = asyncio.get_event_loop().time()
                     call_duration = call_end_time - call_start_time
@@ -673,8 +1403,20 @@ class WeaviateManager:
 
                     offset += batch_size
 
-                dimensions = len(all_chunks[0].vector["default"])
+                # Vectors are only fetched for chunks that have to be projected again
+                dimensions = 0
+                sample = await embedder_collection.query.fetch_objects(
+                    filters=Filter.by_property("doc_uuid").equal(uuid),
+                    limit=1,
+                    return_properties=[],
+                    include_vector=True,
+                )
+                if sample.objects:
+                    dimensions = len(sample.objects[0].vector["default"])
 
+                coordinates = await self.get_chunk_coordinates(
+                    client, embedder, all_chunks
+                )
                 chunks = [
                     {
                         "vector": {"x": pca[0], "y": pca[1], "z": pca[2]},
@@ -682,30 +1424,41 @@ class WeaviateManager:
                         "chunk_id": item.properties["chunk_id"],
                     }
                     for item in all_chunks
-                    if (pca := item.properties["pca"]) is not None
+                    if (pca := coordinates.get(str(item.uuid))) is not None
                 ]
                 return {
                     "embedder": embedder,
                     "dimensions": dimensions,
-                    "groups": [{"name": document["title"], "chunks": chunks}],
+                    "total_points": len(chunks),
+                    "groups": sample_vector_groups(
+                        [{"name": document["title"], "chunks": chunks}], max_points
+                    ),
                 }
 
-            # Generate PCA for all embeddings
+            # Stored coordinates share the projection of the embedding collection,
+            # only chunks projected before it was frozen are projected again
             else:
                 vector_map = {}
-                vector_list, vector_ids, vector_chunk_uuids, vector_chunk_ids = (
-                    [],
-                    [],
-                    [],
-                    [],
+                items = [
+                    item
+                    async for item in embedder_collection.iterator(
+                        return_properties=["doc_uuid", "chunk_id", "pca", "pca_version"]
+                    )
+                ]
+                coordinates = await self.get_chunk_coordinates(client, embedder, items)
+                documents = await self.get_documents_by_ids(
+                    client,
+                    [item.properties["doc_uuid"] for item in items],
+                    properties=["title"],
                 )
-                dimensions = 0
 
-                async for item in embedder_collection.iterator(include_vector=True):
+                for item in items:
                     doc_uuid = item.properties["doc_uuid"]
-                    chunk_uuid = item.uuid
+                    pca = coordinates.get(str(item.uuid))
+                    if pca is None:
+                        continue
                     if doc_uuid not in vector_map:
-                        _document = await self.get_document(client, doc_uuid)
+                        _document = documents.get(str(doc_uuid))
                         if _document:
                             vector_map[doc_uuid] = {
                                 "name": _document["title"],
@@ -713,50 +1466,44 @@ class WeaviateManager:
                             }
                         else:
                             continue
-                    vector_list.append(item.vector["default"])
-                    dimensions = len(item.vector["default"])
-                    vector_ids.append(doc_uuid)
-                    vector_chunk_uuids.append(chunk_uuid)
-                    vector_chunk_ids.append(item.properties["chunk_id"])
-
-                if len(vector_ids) > 3:
-                    pca = PCA(n_components=3)
-                    generated_pca_embeddings = pca.fit_transform(vector_list)
-                    pca_embeddings = [
-                        pca_.tolist() for pca_ in generated_pca_embeddings
-                    ]
+                    vector_map[doc_uuid]["chunks"].append(
+                        {
+                            "vector": {"x": pca[0], "y": pca[1], "z": pca[2]},
+                            "uuid": str(item.uuid),
+                            "chunk_id": item.properties["chunk_id"],
+                        }
+                    )
 
-                    for pca_embedding, _uuid, _chunk_uuid, _chunk_id in zip(
-                        pca_embeddings,
-                        vector_ids,
-                        vector_chunk_uuids,
-                        vector_chunk_ids,
-                    ):
-                        vector_map[_uuid]["chunks"].append(
-                            {
-                                "vector": {
-                                    "x": pca_embedding[0],
-                                    "y": pca_embedding[1],
-                                    "z": pca_embedding[2],
-                                },
-                                "uuid": str(_chunk_uuid),
-                                "chunk_id": _chunk_id,
-                            }
-                        )
+                dimensions = 0
+                sample = await embedder_collection.query.fetch_objects(
+                    limit=1, return_properties=[], include_vector=True
+                )
+                if sample.objects:
+                    dimensions = len(sample.objects[0].vector["default"])
 
-                    return {
-                        "embedder": embedder,
-                        "dimensions": dimensions,
-                        "groups": list(vector_map.values()),
-                    }
-                else:
-                    return {
-                        "embedder": embedder,
-                        "dimensions": dimensions,
-                        "groups": [],
-                    }
+                groups = list(vector_map.values())
+                return {
+                    "embedder": embedder,
+                    "dimensions": dimensions,
+                    "total_points": sum(len(group["chunks"]) for group in groups),
+                    "groups": sample_vector_groups(groups, max_points),
+                }
+
+    def get_chunk_filters(self, labels: list[str], document_uuids: list[str]):
+        filters = []
+
+        if labels:
+            filters.append(Filter.by_property("labels").contains_all(labels))
 
-        return None
+        if document_uuids:
+            filters.append(Filter.by_property("doc_uuid").contains_any(document_uuids))
+
+        if not filters:
+            return None
+        apply_filters = filters[0]
+        for filter in filters[1:]:
+            apply_filters = apply_filters & filter
+        return apply_filters
 
     async def hybrid_chunks(
         self,
@@ -768,45 +1515,47 @@ class WeaviateManager:
         limit: int,
         labels: list[str],
         document_uuids: list[str],
+        alpha: float = 0.5,
     ):
+        """Hybrid search, alpha weights vector search against keyword search (1 is vector only)"""
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
+            limits = (
+                {"auto_limit": limit} if limit_mode == "Autocut" else {"limit": limit}
+            )
+            chunks = await embedder_collection.query.hybrid(
+                query=query,
+                vector=vector,
+                alpha=alpha,
+                return_metadata=MetadataQuery(score=True, explain_score=False),
+                filters=self.get_chunk_filters(labels, document_uuids),
+                **limits,
+            )
 
-            filters = []
-
-            if labels:
-                filters.append(Filter.by_property("labels").contains_all(labels))
-
-            if document_uuids:
-                filters.append(
-                    Filter.by_property("doc_uuid").contains_any(document_uuids)
-                )
-
-            if filters:
-                apply_filters = filters[0]
-                for filter in filters[1:]:
-                    apply_filters = apply_filters & filter
-            else:
-                apply_filters = None
+            return chunks.objects
 
-            if limit_mode == "Autocut":
-                chunks = await embedder_collection.query.hybrid(
-                    query=query,
-                    vector=vector,
-                    alpha=0.5,
-                    auto_limit=limit,
-                    return_metadata=MetadataQuery(score=True, explain_score=False),
-                    filters=apply_filters,
-                )
-            else:
-                chunks = await embedder_collection.query.hybrid(
-                    query=query,
-                    vector=vector,
-                    alpha=0.5,
-                    limit=limit,
-                    return_metadata=MetadataQuery(score=True, explain_score=False),
-                    filters=apply_filters,
-                )
+    async def keyword_chunks(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        query: str,
+        limit_mode: str,
+        limit: int,
+        labels: list[str],
+        document_uuids: list[str],
+    ):
+        """BM25 search, needs no query vector"""
+        if await self.verify_embedding_collection(client, embedder):
+            embedder_collection = client.collections.get(self.embedding_table[embedder])
+            limits = (
+                {"auto_limit": limit} if limit_mode == "Autocut" else {"limit": limit}
+            )
+            chunks = await embedder_collection.query.bm25(
+                query=query,
+                return_metadata=MetadataQuery(score=True, explain_score=False),
+                filters=self.get_chunk_filters(labels, document_uuids),
+                **limits,
+            )
 
             return chunks.objects
 
@@ -828,47 +1577,183 @@ class WeaviateManager:
                 msg.fail(f"Failed to fetch chunks: {str(e)}")
                 raise e
 
+    async def get_chunks_by_document_ids(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        ids_by_document: dict[str, list[int]],
+    ) -> dict[str, list]:
+        """Fetch chunks of several documents by chunk id in one query, returns the chunks grouped by doc_uuid"""
+        ids_by_document = {
+            str(doc_uuid): list(ids) for doc_uuid, ids in ids_by_document.items() if ids
+        }
+        chunks_by_document = {doc_uuid: [] for doc_uuid in ids_by_document}
+        if ids_by_document and await self.verify_embedding_collection(client, embedder):
+            embedder_collection = client.collections.get(self.embedding_table[embedder])
+            try:
+                weaviate_chunks = await embedder_collection.query.fetch_objects(
+                    filters=Filter.any_of(
+                        [
+                            Filter.by_property("doc_uuid").equal(doc_uuid)
+                            & Filter.by_property("chunk_id").contains_any(ids)
+                            for doc_uuid, ids in ids_by_document.items()
+                        ]
+                    ),
+                    limit=sum(len(ids) for ids in ids_by_document.values()),
+                    sort=Sort.by_property("chunk_id", ascending=True),
+                )
+            except Exception as e:
+                msg.fail(f"Failed to fetch chunks: {str(e)}")
+                raise e
+            for chunk in weaviate_chunks.objects:
+                doc_uuid = str(chunk.properties["doc_uuid"])
+                if doc_uuid in chunks_by_document:
+                    chunks_by_document[doc_uuid].append(chunk)
+        return chunks_by_document
+
     ### Suggestion Logic
 
-    async def add_suggestion(self, client: WeaviateAsyncClient, query: str):
-        if await self.verify_collection(client, self.suggestion_collection_name):
-            suggestion_collection = client.collections.get(
-                self.suggestion_collection_name
+    async def get_suggestion_index(
+        self, client: WeaviateAsyncClient
+    ) -> SuggestionIndex:
+        """Prefix index of all stored suggestions, loaded from Weaviate once per client"""
+        index = self.suggestion_indexes.get(client)
+        if index is not None:
+            return index
+        async with self.suggestion_lock:
+            index = self.suggestion_indexes.get(client)
+            if index is not None:
+                return index
+            index = SuggestionIndex()
+            if await self.verify_collection(client, self.suggestion_collection_name):
+                suggestion_collection = client.collections.get(
+                    self.suggestion_collection_name
+                )
+                batch_size = 1000
+                after = None
+                while True:
+                    suggestions = await suggestion_collection.query.fetch_objects(
+                        limit=batch_size,
+                        after=after,
+                        return_properties=["query", "timestamp"],
+                    )
+                    for suggestion in suggestions.objects:
+                        index.add(
+                            suggestion.properties["query"],
+                            suggestion.properties["timestamp"],
+                            suggestion.uuid,
+                        )
+                    if len(suggestions.objects) < batch_size:
+                        break
+                    after = suggestions.objects[-1].uuid
+            # Queries searched while the index was loading
+            for query, timestamp in self.pending_suggestions.get(client, {}).items():
+                index.add(query, timestamp, generate_uuid5(query))
+            self.suggestion_indexes[client] = index
+            msg.info(f"Loaded {len(index)} suggestions")
+            return index
+
+    def add_suggestion(self, client: WeaviateAsyncClient, query: str):
+        """Queue a query for the suggestions, written in the background so searches don't wait on it"""
+        pending = self.pending_suggestions.setdefault(client, {})
+        pending[query] = datetime.now(timezone.utc).isoformat()
+        index = self.suggestion_indexes.get(client)
+        if index is not None:
+            index.add(query, pending[query], generate_uuid5(query))
+
+        task = self.suggestion_tasks.get(client)
+        if len(pending) >= self.suggestion_batch_size:
+            self.suggestion_tasks[client] = asyncio.create_task(
+                self.flush_suggestions(client)
             )
-            aggregation = await suggestion_collection.aggregate.over_all(
-                total_count=True
+        elif task is None or task.done():
+            self.suggestion_tasks[client] = asyncio.create_task(
+                self.flush_suggestions(client, delay=self.suggestion_flush_interval)
             )
-            if aggregation.total_count > 0:
-                does_suggestion_exists = (
-                    await suggestion_collection.query.fetch_objects(
-                        filters=Filter.by_property("query").equal(query)
-                    )
+
+    async def flush_suggestions(self, client: WeaviateAsyncClient, delay: float = 0):
+        """Write all queued suggestions, skipping queries that are already stored"""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        pending = self.pending_suggestions.pop(client, None)
+        if not pending:
+            return
+        try:
+            failed = await self.add_suggestions(client, pending)
+        except Exception as e:
+            msg.warn(f"Couldn't save {len(pending)} suggestions: {str(e)}")
+            failed = pending
+
+        retries = self.suggestion_retries.setdefault(client, {})
+        for query in pending:
+            if query not in failed:
+                retries.pop(query, None)
+        dropped = 0
+        for query, timestamp in failed.items():
+            retries[query] = retries.get(query, 0) + 1
+            if retries[query] > self.suggestion_max_retries:
+                retries.pop(query)
+                dropped += 1
+            else:
+                # Queries searched again in the meantime keep their newer timestamp
+                self.pending_suggestions.setdefault(client, {}).setdefault(
+                    query, timestamp
                 )
-                if len(does_suggestion_exists.objects) > 0:
-                    return
-            await suggestion_collection.data.insert(
-                {"query": query, "timestamp": datetime.now().isoformat()}
+        if dropped:
+            msg.warn(f"Dropped {dropped} suggestions after repeated failures")
+        task = self.suggestion_tasks.get(client)
+        if client in self.pending_suggestions and (
+            task is None or task.done() or task is asyncio.current_task()
+        ):
+            self.suggestion_tasks[client] = asyncio.create_task(
+                self.flush_suggestions(client, delay=self.suggestion_flush_interval)
             )
 
+    async def add_suggestions(
+        self, client: WeaviateAsyncClient, suggestions: dict[str, str]
+    ) -> dict[str, str]:
+        """Insert suggestions (query -> timestamp) that don't exist yet, returns the ones that failed"""
+        if not await self.verify_collection(client, self.suggestion_collection_name):
+            return suggestions
+        suggestion_collection = client.collections.get(self.suggestion_collection_name)
+        # Same uuid as in the suggestion index, so stored queries are found by id
+        uuids = {generate_uuid5(query): query for query in suggestions}
+        existing = await suggestion_collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(list(uuids)),
+            limit=len(uuids),
+            return_properties=[],
+        )
+        stored = {str(obj.uuid) for obj in existing.objects}
+
+        new_suggestions = [
+            DataObject(
+                properties={"query": query, "timestamp": suggestions[query]},
+                uuid=uuid,
+            )
+            for uuid, query in uuids.items()
+            if uuid not in stored
+        ]
+        if not new_suggestions:
+            return {}
+        response = await suggestion_collection.data.insert_many(new_suggestions)
+        if not response.has_errors:
+            return {}
+        failed = {}
+        for i, error in response.errors.items():
+            query = new_suggestions[i].properties["query"]
+            # Stored by another worker since the lookup
+            if "already exists" in error.message:
+                continue
+            msg.warn(f"Couldn't save suggestion {query}: {error.message}")
+            failed[query] = suggestions[query]
+        return failed
+
     async def retrieve_suggestions(
         self, client: WeaviateAsyncClient, query: str, limit: int
     ):
-        if await self.verify_collection(client, self.suggestion_collection_name):
-            suggestion_collection = client.collections.get(
-                self.suggestion_collection_name
-            )
-            suggestions = await suggestion_collection.query.bm25(
-                query=query, limit=limit
-            )
-            return_suggestions = [
-                {
-                    "query": suggestion.properties["query"],
-                    "timestamp": suggestion.properties["timestamp"],
-                    "uuid": str(suggestion.uuid),
-                }
-                for suggestion in suggestions.objects
-            ]
-            return return_suggestions
+        """Autocomplete from the in-memory suggestion index, ranked by frequency and recency"""
+        index = await self.get_suggestion_index(client)
+        return index.search(query, limit)
 
     async def retrieve_all_suggestions(
         self, client: WeaviateAsyncClient, page: int, pageSize: int
@@ -902,41 +1787,96 @@ class WeaviateManager:
                 self.suggestion_collection_name
             )
             await suggestion_collection.data.delete_by_id(uuid)
+            index = self.suggestion_indexes.get(client)
+            if index is not None:
+                query = index.remove(uuid)
+                if query is not None:
+                    self.pending_suggestions.get(client, {}).pop(query, None)
 
     async def delete_all_suggestions(self, client: WeaviateAsyncClient):
         if await self.verify_collection(client, self.suggestion_collection_name):
             await client.collections.delete(self.suggestion_collection_name)
+            self.invalidate_collections(client)
+            self.clear_pending_suggestions(client)
+            self.suggestion_indexes[client] = SuggestionIndex()
+
+    def clear_pending_suggestions(self, client: WeaviateAsyncClient):
+        """Drop queued suggestions, so a flush doesn't write them back after a reset"""
+        task = self.suggestion_tasks.pop(client, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        self.pending_suggestions.pop(client, None)
+        self.suggestion_retries.pop(client, None)
 
     ### Cache Logic
 
-    # TODO: Implement Cache Logic
+    async def get_cached_vectors(
+        self, client: WeaviateAsyncClient, embedder: str, hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """Look up embeddings by content hash, returns only the hashes that were found"""
+        vectors = {}
+        if hashes and await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            batch_size = 500
+            for i in range(0, len(hashes), batch_size):
+                batch = hashes[i : i + batch_size]
+                response = await cache_collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(
+                        [generate_uuid5(_hash) for _hash in batch]
+                    ),
+                    limit=len(batch),
+                    return_properties=["hash"],
+                    include_vector=True,
+                )
+                for item in response.objects:
+                    vectors[item.properties["hash"]] = item.vector["default"]
+        return vectors
+
+    async def add_cached_vectors(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        vectors: dict[str, list[float]],
+    ):
+        if vectors and await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            response = await cache_collection.data.insert_many(
+                [
+                    DataObject(
+                        properties={"hash": _hash},
+                        uuid=generate_uuid5(_hash),
+                        vector=vector,
+                    )
+                    for _hash, vector in vectors.items()
+                ]
+            )
+            if response.has_errors:
+                msg.warn(
+                    f"Failed to cache {len(response.errors)} of {len(vectors)} embeddings"
+                )
 
     ### Metadata Retrieval
 
     async def get_datacount(
         self, client: WeaviateAsyncClient, embedder: str, document_uuids: list[str] = []
     ) -> int:
-        if await self.verify_embedding_collection(client, embedder):
-            embedder_collection = client.collections.get(self.embedding_table[embedder])
-
-            if document_uuids:
-                filters = Filter.by_property("doc_uuid").contains_any(document_uuids)
-            else:
-                filters = None
-            try:
-                response = await embedder_collection.aggregate.over_all(
-                    filters=filters,
-                    group_by=GroupByAggregate(prop="doc_uuid"),
-                    total_count=True,
-                )
-                return len(response.groups)
-            except Exception as e:
-                msg.fail(f"Failed to retrieve data count: {str(e)}")
-                return 0
+        try:
+            statistics = await self.get_statistics(client)
+            return statistics.get_document_count(
+                embedder=embedder, document_uuids=document_uuids
+            )
+        except Exception as e:
+            msg.fail(f"Failed to retrieve data count: {str(e)}")
+            return 0
 
     async def get_chunk_count(
         self, client: WeaviateAsyncClient, embedder: str, doc_uuid: str
     ) -> int:
+        statistics = await self.get_statistics(client)
+        chunk_count = statistics.get_chunk_count(doc_uuid)
+        if chunk_count is not None:
+            return chunk_count
+
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
             response = await embedder_collection.aggregate.over_all(
@@ -1001,6 +1941,11 @@ class ChunkerManager:
             chunker.name: chunker for chunker in chunkers
         }
 
+    def prepare_documents(self, chunker: str, documents: list[Document]):
+        """Process the spaCy Docs of many documents at once for chunkers that need them"""
+        if chunker in self.chunkers and self.chunkers[chunker].requires_spacy:
+            process_spacy_docs(documents)
+
     async def chunk(
         self,
         chunker: str,
@@ -1024,6 +1969,7 @@ class ChunkerManager:
                     embedder_config=embedder_config,
                 )
                 for chunked_document in chunked_documents:
+                    chunked_document.release_spacy_doc()
                     chunked_document.meta["Chunker"] = (
                         fileConfig.rag_config["Chunker"]
                         .components[chunker]
@@ -1060,6 +2006,33 @@ class EmbeddingManager:
         self.embedders: dict[str, Embedding] = {
             embedder.name: embedder for embedder in embedders
         }
+        self.schedulers: dict[str, EmbeddingScheduler] = {
+            embedder.name: EmbeddingScheduler(
+                max_concurrent_requests=embedder.max_concurrent_requests,
+                requests_per_minute=embedder.requests_per_minute,
+                tokens_per_minute=embedder.tokens_per_minute,
+                max_retries=int(os.getenv("VERBA_EMBED_MAX_RETRIES", 5)),
+            )
+            for embedder in embedders
+        }
+        # Content addressed cache of chunk embeddings, keyed by (embedder, model, content hash)
+        self.embedding_cache = LRUCache(int(os.getenv("VERBA_EMBED_CACHE_SIZE", 5000)))
+        # Query embeddings, keyed by (embedder, hash of the embedder config, normalized query)
+        self.query_cache = LRUCache(
+            int(os.getenv("VERBA_QUERY_CACHE_SIZE", 1000)),
+            ttl=float(os.getenv("VERBA_QUERY_CACHE_TTL", 3600)),
+        )
+        self.persist_cache = os.getenv("VERBA_EMBED_CACHE_PERSIST", "true").lower() in [
+            "true",
+            "1",
+        ]
+
+    async def warm_up(self):
+        for embedder in self.embedders.values():
+            try:
+                await embedder.warm_up()
+            except Exception as e:
+                msg.warn(f"Failed to warm up {embedder.name} Embedder: {str(e)}")
 
     async def vectorize(
         self,
@@ -1067,9 +2040,12 @@ class EmbeddingManager:
         fileConfig: FileConfig,
         documents: list[Document],
         logger: LoggerManager,
+        client: WeaviateAsyncClient | None = None,
+        weaviate_manager: WeaviateManager | None = None,
     ) -> list[Document]:
         """Vectorizes chunks in batches
         @parameter: documents : Document - Verba document
+        @parameter: client, weaviate_manager - (Optional) Enables the persistent embedding cache
         @returns Document - Document with vectorized chunks
         """
         try:
@@ -1083,22 +2059,27 @@ class EmbeddingManager:
                         document.metadata + "\n" + chunk.content
                         for chunk in document.chunks
                     ]
-                    embeddings = await self.batch_vectorize(embedder, config, content)
 
-                    if len(embeddings) >= 3:
-                        pca = PCA(n_components=3)
-                        generated_pca_embeddings = pca.fit_transform(embeddings)
-                        pca_embeddings = [
-                            pca_.tolist() for pca_ in generated_pca_embeddings
-                        ]
-                    else:
-                        pca_embeddings = [embedding[0:3] for embedding in embeddings]
+                    async def report_progress(completed: int, total: int):
+                        await logger.send_report(
+                            fileConfig.fileID,
+                            FileStatus.EMBEDDING,
+                            f"Vectorized {completed} of {total} chunks",
+                            took=round(loop.time() - start_time, 2),
+                        )
 
-                    for vector, chunk, pca_ in zip(
-                        embeddings, document.chunks, pca_embeddings
-                    ):
+                    embeddings = await self.batch_vectorize(
+                        embedder,
+                        config,
+                        content,
+                        report_progress,
+                        client,
+                        weaviate_manager,
+                    )
+
+                    # 3D coordinates are projected at import, see WeaviateManager.project_chunks
+                    for vector, chunk in zip(embeddings, document.chunks):
                         chunk.vector = vector
-                        chunk.pca = pca_
 
                     document.meta["Embedder"] = (
                         fileConfig.rag_config["Embedder"]
@@ -1123,48 +2104,156 @@ class EmbeddingManager:
             raise e
 
     async def batch_vectorize(
-        self, embedder: str, config: dict, content: list[str]
+        self,
+        embedder: str,
+        config: dict,
+        content: list[str],
+        progress: Callable[[int, int], Awaitable] | None = None,
+        client: WeaviateAsyncClient | None = None,
+        weaviate_manager: WeaviateManager | None = None,
     ) -> list[list[float]]:
-        """Vectorize content in batches"""
+        """Vectorize content in batches, only content missing from the embedding cache is sent to the Embedder
+        @parameter: progress : Callable | None - (Optional) Awaited with (completed, total) after each finished batch
+        @parameter: client, weaviate_manager - (Optional) Enables the persistent cache stored in the VERBA_Cache_* collections
+        """
         try:
-            batches = [
-                content[i : i + self.embedders[embedder].max_batch_size]
-                for i in range(0, len(content), self.embedders[embedder].max_batch_size)
-            ]
-            msg.info(f"Vectorizing {len(content)} chunks in {len(batches)} batches")
-            tasks = [
-                self.embedders[embedder].vectorize(config, batch) for batch in batches
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Check if all tasks were successful
-            errors = [r for r in results if isinstance(r, Exception)]
-            if errors:
-                error_messages = [str(e) for e in errors]
-                raise Exception(
-                    f"Vectorization failed for some batches: {', '.join(error_messages)}"
-                )
+            model = config["Model"].value if "Model" in config else None
+            persist = (
+                self.persist_cache
+                and client is not None
+                and weaviate_manager is not None
+                and model is not None
+            )
+            hashes = [hash_content(text) for text in content]
+            vectors: dict[str, list[float]] = {}
+
+            if model is not None:
+                for _hash in dict.fromkeys(hashes):
+                    vector = self.embedding_cache.get((embedder, model, _hash))
+                    if vector is not None:
+                        vectors[_hash] = vector.tolist()
+
+            missing = [_hash for _hash in dict.fromkeys(hashes) if _hash not in vectors]
+            if missing and persist:
+                try:
+                    stored = await weaviate_manager.get_cached_vectors(
+                        client, model, missing
+                    )
+                except Exception as e:
+                    msg.warn(f"Embedding cache lookup failed: {str(e)}")
+                    stored = {}
+                for _hash, vector in stored.items():
+                    vectors[_hash] = vector
+                    self.embedding_cache.put(
+                        (embedder, model, _hash), np.asarray(vector, dtype=np.float32)
+                    )
 
-            # Flatten the results
-            flattened_results = [item for sublist in results for item in sublist]
+            missing_content: dict[str, str] = {}
+            for _hash, text in zip(hashes, content):
+                if _hash not in vectors:
+                    missing_content.setdefault(_hash, text)
 
-            # Verify the number of vectors matches the input content
-            if len(flattened_results) != len(content):
-                raise Exception(
-                    f"Mismatch in vectorization results: expected {len(content)} vectors, got {len(flattened_results)}"
+            cached = sum(1 for _hash in hashes if _hash in vectors)
+            if cached > 0:
+                msg.info(
+                    f"Found {cached} of {len(content)} chunks in the embedding cache"
                 )
 
-            return flattened_results
+            if missing_content:
+                embeddings = await self.vectorize_batches(
+                    embedder, config, list(missing_content.values()), progress
+                )
+                new_vectors = dict(zip(missing_content.keys(), embeddings))
+                vectors.update(new_vectors)
+
+                if model is not None:
+                    for _hash, vector in new_vectors.items():
+                        self.embedding_cache.put(
+                            (embedder, model, _hash),
+                            np.asarray(vector, dtype=np.float32),
+                        )
+                if persist:
+                    try:
+                        await weaviate_manager.add_cached_vectors(
+                            client, model, new_vectors
+                        )
+                    except Exception as e:
+                        msg.warn(f"Failed to store embeddings in cache: {str(e)}")
+
+            return [vectors[_hash] for _hash in hashes]
         except Exception as e:
             raise Exception(f"Batch vectorization failed: {str(e)}")
 
+    async def vectorize_batches(
+        self,
+        embedder: str,
+        config: dict,
+        content: list[str],
+        progress: Callable[[int, int], Awaitable] | None = None,
+    ) -> list[list[float]]:
+        """Vectorize content in batches, scheduled by the Embedder's EmbeddingScheduler"""
+        batches = [
+            content[i : i + self.embedders[embedder].max_batch_size]
+            for i in range(0, len(content), self.embedders[embedder].max_batch_size)
+        ]
+        msg.info(f"Vectorizing {len(content)} chunks in {len(batches)} batches")
+        scheduler = self.schedulers[embedder]
+        completed = 0
+
+        async def vectorize_batch(batch: list[str]) -> list[list[float]]:
+            nonlocal completed
+            embeddings = await scheduler.run(
+                lambda: self.embedders[embedder].vectorize(config, batch),
+                scheduler.estimate_tokens(batch),
+            )
+            completed += len(batch)
+            if progress is not None:
+                await progress(completed, len(content))
+            return embeddings
+
+        tasks = [vectorize_batch(batch) for batch in batches]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Check if all tasks were successful
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            error_messages = [str(e) for e in errors]
+            raise Exception(
+                f"Vectorization failed for some batches: {', '.join(error_messages)}"
+            )
+
+        # Flatten the results
+        flattened_results = [item for sublist in results for item in sublist]
+
+        # Verify the number of vectors matches the input content
+        if len(flattened_results) != len(content):
+            raise Exception(
+                f"Mismatch in vectorization results: expected {len(content)} vectors, got {len(flattened_results)}"
+            )
+
+        return flattened_results
+
     async def vectorize_query(
         self, embedder: str, content: str, rag_config: dict
     ) -> list[float]:
         try:
             if embedder in self.embedders:
                 config = rag_config["Embedder"].components[embedder].config
+                cache_key = (
+                    embedder,
+                    hash_content(
+                        json.dumps(
+                            {key: config[key].value for key in config}, sort_keys=True
+                        )
+                    ),
+                    # Only whitespace is normalized, embeddings can be case sensitive
+                    " ".join(content.split()),
+                )
+                vector = self.query_cache.get(cache_key)
+                if vector is not None:
+                    return vector
                 embeddings = await self.embedders[embedder].vectorize(config, [content])
+                self.query_cache.put(cache_key, embeddings[0])
                 return embeddings[0]
             else:
                 raise Exception(f"{embedder} Embedder not found")
@@ -1177,6 +2266,54 @@ class RetrieverManager:
         self.retrievers: dict[str, Retriever] = {
             retriever.name: retriever for retriever in retrievers
         }
+        # Retrieved documents and context, keyed by get_cache_key
+        self.retrieval_cache = LRUCache(
+            int(os.getenv("VERBA_RETRIEVAL_CACHE_SIZE", 500)),
+            ttl=float(os.getenv("VERBA_RETRIEVAL_CACHE_TTL", 3600)),
+        )
+
+    async def get_cache_key(
+        self,
+        client,
+        query: str,
+        rag_config: dict,
+        weaviate_manager: WeaviateManager,
+        labels: list[str],
+        document_uuids: list[str],
+        max_tokens: int | None = None,
+    ) -> tuple:
+        """Cache key of a retrieval, the corpus version invalidates it after every import and delete"""
+        retriever = rag_config["Retriever"].selected
+        embedder = rag_config["Embedder"].selected
+        configs = {
+            component: {
+                key: setting.value
+                for key, setting in rag_config[component]
+                .components[selected]
+                .config.items()
+            }
+            for component, selected in [
+                ("Retriever", retriever),
+                ("Embedder", embedder),
+            ]
+        }
+        return (
+            await weaviate_manager.get_corpus_version(client),
+            retriever,
+            embedder,
+            hash_content(json.dumps(configs, sort_keys=True)),
+            # Same normalization as the query embedding, results can be case sensitive
+            " ".join(query.split()),
+            tuple(sorted(labels)),
+            tuple(sorted(document_uuids)),
+            max_tokens,
+        )
+
+    def requires_vector(self, retriever: str, rag_config: dict) -> bool:
+        if retriever not in self.retrievers:
+            raise Exception(f"Retriever {retriever} not found")
+        config = rag_config["Retriever"].components[retriever].config
+        return self.retrievers[retriever].requires_vector(config)
 
     async def retrieve(
         self,
@@ -1188,6 +2325,7 @@ class RetrieverManager:
         weaviate_manager: WeaviateManager,
         labels: list[str],
         document_uuids: list[str],
+        max_tokens: int | None = None,
     ):
         try:
             if retriever not in self.retrievers:
@@ -1209,6 +2347,7 @@ class RetrieverManager:
                 embedder_model,
                 labels,
                 document_uuids,
+                max_tokens=max_tokens,
             )
             return (documents, context)
 
@@ -1221,6 +2360,15 @@ class GeneratorManager:
         self.generators: dict[str, Generator] = {
             generator.name: generator for generator in generators
         }
+        # Share of the context window of a generator that retrieved chunks may fill
+        self.context_ratio = float(os.getenv("VERBA_CONTEXT_WINDOW_RATIO", 0.75))
+
+    def get_context_budget(self, rag_config: dict) -> int:
+        """Token budget for the retrieved context of the selected generator"""
+        generator = rag_config["Generator"].selected
+        if generator not in self.generators:
+            raise Exception(f"Generator {generator} not found")
+        return int(self.generators[generator].context_window * self.context_ratio)
 
     async def generate_stream(self, rag_config, query, context, conversation):
         """Generate a stream of response dicts based on a list of queries and list of contexts, and includes conversational context
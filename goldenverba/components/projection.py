@@ -0,0 +1,160 @@
+import base64
+import secrets
+
+import numpy as np
+from sklearn.decomposition import IncrementalPCA
+
+# Fitted state of IncrementalPCA that is needed to continue with partial_fit
+PCA_STATE = [
+    "components_",
+    "mean_",
+    "var_",
+    "singular_values_",
+    "explained_variance_",
+    "explained_variance_ratio_",
+    "noise_variance_",
+    "n_samples_seen_",
+    "n_components_",
+    "n_features_in_",
+]
+
+
+class Projection:
+    """
+    3D projection of all vectors of one embedding collection for the visualizer.
+    Fitted incrementally with the imported chunks until sample_size vectors were seen, then frozen,
+    so coordinates stay comparable. Every fit changes the version, coordinates of an older version are stale.
+    """
+
+    n_components = 3
+
+    def __init__(self, sample_size: int = 5000):
+        self.pca = IncrementalPCA(n_components=self.n_components)
+        self.sample_size = sample_size
+        self.frozen = False
+        # 0 while not fitted, the first 3 dimensions of the vectors are used then
+        self.version = 0
+        # IncrementalPCA needs at least n_components samples per fit
+        self.pending: np.ndarray | None = None
+
+    @property
+    def fitted(self) -> bool:
+        return hasattr(self.pca, "components_")
+
+    def partial_fit(self, vectors: list[list[float]]):
+        if self.frozen:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.pending is not None:
+            vectors = np.vstack([self.pending, vectors])
+        if len(vectors) < self.n_components:
+            self.pending = vectors
+            return
+        self.pca.partial_fit(vectors)
+        self.pending = None
+        # JavaScript safe integer, stored with every chunk
+        self.version = secrets.randbits(53)
+        self.frozen = bool(self.pca.n_samples_seen_ >= self.sample_size)
+
+    def transform(self, vectors: list[list[float]]) -> list[list[float]]:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) == 0:
+            return []
+        if not self.fitted:
+            return vectors[:, : self.n_components].tolist()
+        return self.pca.transform(vectors).tolist()
+
+    def fit_transform(self, vectors: list[list[float]]) -> list[list[float]]:
+        self.partial_fit(vectors)
+        return self.transform(vectors)
+
+    def to_json(self) -> dict:
+        state = {}
+        if self.fitted:
+            for attribute in PCA_STATE:
+                value = getattr(self.pca, attribute)
+                state[attribute] = (
+                    value.tolist()
+                    if isinstance(value, (np.ndarray, np.generic))
+                    else value
+                )
+        return {
+            "pca": state,
+            "pending": self.pending.tolist() if self.pending is not None else None,
+            "version": self.version,
+            "frozen": self.frozen,
+        }
+
+    @staticmethod
+    def from_json(data: dict, sample_size: int = 5000) -> "Projection":
+        projection = Projection(sample_size)
+        projection.version = data.get("version", 0)
+        projection.frozen = data.get("frozen", False)
+        for attribute, value in data.get("pca", {}).items():
+            if isinstance(value, list):
+                value = np.asarray(value, dtype=np.float32)
+            elif attribute in ["n_samples_seen_", "n_components_", "n_features_in_"]:
+                value = int(value)
+            setattr(projection.pca, attribute, value)
+        if data.get("pending") is not None:
+            projection.pending = np.asarray(data["pending"], dtype=np.float32)
+        return projection
+
+
+def sample_vector_groups(groups: list[dict], max_points: int) -> list[dict]:
+    """Downsample the chunks of the vector view to max_points, stratified per document.
+    Every document keeps at least one point and points are spread evenly over its chunks
+    """
+    sizes = [len(group["chunks"]) for group in groups]
+    total = sum(sizes)
+    if max_points <= 0 or total <= max_points:
+        return groups
+
+    quotas = [min(size, max(1, size * max_points // total)) for size in sizes]
+    overflow = sum(quotas) - max_points
+    for index in sorted(range(len(quotas)), key=lambda i: quotas[i], reverse=True):
+        if overflow <= 0:
+            break
+        cut = min(overflow, quotas[index] - 1)
+        quotas[index] -= cut
+        overflow -= cut
+
+    return [
+        {
+            **group,
+            "chunks": [group["chunks"][i * size // quota] for i in range(quota)],
+        }
+        for group, size, quota in zip(groups, sizes, quotas)
+        if quota > 0
+    ]
+
+
+def encode_vector_groups(groups: list[dict]) -> dict:
+    """Compact encoding of the vector view, coordinates as one base64 float16 array with a separate id table"""
+    coordinates = []
+    uuids = []
+    chunk_ids = []
+    encoded_groups = []
+    for group in groups:
+        encoded_groups.append(
+            {
+                "name": group["name"],
+                "offset": len(uuids),
+                "count": len(group["chunks"]),
+            }
+        )
+        for chunk in group["chunks"]:
+            vector = chunk["vector"]
+            coordinates.append([vector["x"], vector["y"], vector["z"]])
+            uuids.append(chunk["uuid"])
+            chunk_ids.append(chunk["chunk_id"])
+
+    return {
+        "encoding": "float16",
+        "groups": encoded_groups,
+        "uuids": uuids,
+        "chunk_ids": chunk_ids,
+        "coordinates": base64.b64encode(
+            np.asarray(coordinates, dtype="<f2").reshape(-1, 3).tobytes()
+        ).decode("ascii"),
+    }
@@ -1,13 +1,22 @@
 import base64
 import json
-import io
-import csv
 
 from wasabi import msg
 
-from goldenverba.components.document import Document, create_document
+from goldenverba.components.document import (
+    Document,
+    create_document,
+    load_nlp_for_language,
+)
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
+from goldenverba.components.reader.parsers import (
+    run_in_process_pool,
+    parse_pdf,
+    parse_docx,
+    parse_csv,
+    parse_excel,
+)
 
 # Optional imports with error handling
 try:
@@ -90,10 +99,8 @@ class BasicReader(Reader):
             ".hpp",
         ]  # Add supported text extensions
 
-        # Initialize spaCy model if available
-        self.nlp = spacy.blank("en") if spacy else None
-        if self.nlp:
-            self.nlp.add_pipe("sentencizer", config={"punct_chars": None})
+        # Use the shared spaCy pipeline if available
+        self.nlp = load_nlp_for_language("en") if spacy else None
 
     async def load(self, config: dict, fileConfig: FileConfig) -> list[Document]:
         """
@@ -163,9 +170,7 @@ class BasicReader(Reader):
         """Load and extract text from a PDF file."""
         if not PdfReader:
             raise ImportError("pypdf is not installed. Cannot process PDF files.")
-        pdf_bytes = io.BytesIO(decoded_bytes)
-        reader = PdfReader(pdf_bytes)
-        return "\n\n".join(page.extract_text() for page in reader.pages)
+        return await run_in_process_pool(parse_pdf, decoded_bytes)
 
     async def load_docx_file(self, decoded_bytes: bytes) -> str:
         """Load and extract text from a DOCX file."""
@@ -173,153 +178,14 @@ class BasicReader(Reader):
             raise ImportError(
                 "python-docx is not installed. Cannot process DOCX files."
             )
-        docx_bytes = io.BytesIO(decoded_bytes)
-        reader = docx.Document(docx_bytes)
-        return "\n".join(paragraph.text for paragraph in reader.paragraphs)
+        return await run_in_process_pool(parse_docx, decoded_bytes)
 
     async def load_csv_file(self, decoded_bytes: bytes) -> str:
         """Load and convert CSV file to readable text format."""
-        try:
-            # Try UTF-8 first, fallback to latin-1
-            try:
-                text_content = decoded_bytes.decode("utf-8")
-            except UnicodeDecodeError:
-                text_content = decoded_bytes.decode("latin-1")
-
-            csv_reader = csv.reader(io.StringIO(text_content))
-            rows = list(csv_reader)
-
-            if not rows:
-                return "Empty CSV file"
-
-            # Format as a readable table
-            result = []
-            headers = rows[0] if rows else []
-
-            # Add headers
-            if headers:
-                result.append("Headers: " + " | ".join(headers))
-                result.append(" \n\n")
-
-            # Add data rows
-            for i, row in enumerate(rows[1:], 1):
-                if len(row) == len(headers):
-                    row_data = []
-                    for header, value in zip(headers, row):
-                        row_data.append(f"{header}: {value}")
-                    result.append(f"Row {i}: {' | '.join(row_data)}")
-                else:
-                    # Handle rows with different column counts
-                    result.append(f"Row {i}: {' | '.join(row)}")
-                result.append(" \n\n")
-            return "\n".join(result)
-
-        except Exception as e:
-            raise ValueError(f"Error reading CSV file: {str(e)}")
+        return await run_in_process_pool(parse_csv, decoded_bytes)
 
     async def load_excel_file(self, decoded_bytes: bytes, extension: str) -> str:
         """Load and convert Excel file to readable text format."""
         if not pd and not openpyxl:
             raise ImportError("pandas or openpyxl is required to process Excel files.")
-
-        try:
-            excel_bytes = io.BytesIO(decoded_bytes)
-
-            # Use pandas if available for better support
-            if pd:
-                # Read all sheets
-                if extension == "xlsx":
-                    sheets_dict = pd.read_excel(
-                        excel_bytes, sheet_name=None, engine="openpyxl"
-                    )
-                else:  # xls
-                    try:
-                        sheets_dict = pd.read_excel(
-                            excel_bytes, sheet_name=None, engine="xlrd"
-                        )
-                    except Exception as e:
-                        # Try auto engine detection as fallback
-                        try:
-                            sheets_dict = pd.read_excel(
-                                excel_bytes, sheet_name=None, engine=None
-                            )
-                        except Exception:
-                            raise ImportError(
-                                f"Cannot read .xls file. Please install 'xlrd' for .xls support: pip install xlrd. "
-                                f"Original error: {str(e)}"
-                            )
-
-                result = []
-
-                for sheet_name, df in sheets_dict.items():
-                    result.append(f"\nSheet: {sheet_name}")
-
-                    if df.empty:
-                        result.append("(Empty sheet)")
-                        continue
-
-                    result.append(" \n\n")
-
-                    # Add column headers
-                    headers = df.columns.tolist()
-                    result.append("Headers: " + " | ".join(str(h) for h in headers))
-                    result.append(" \n\n")
-
-                    for idx, (_, row) in enumerate(df.iterrows()):
-                        row_data = []
-                        for header, value in zip(headers, row):
-                            # Handle NaN values
-                            display_value = str(value) if pd.notna(value) else ""
-                            row_data.append(f"{header}: {display_value}")
-                        result.append(f"Row {idx + 1}: {' | '.join(row_data)}")
-                        result.append(" \n\n")
-
-                return "\n".join(result)
-
-            else:
-                # Fallback to openpyxl for basic reading
-                if extension != "xlsx":
-                    raise ImportError(
-                        "openpyxl only supports .xlsx files. Please install pandas for .xls support."
-                    )
-
-                from openpyxl import load_workbook
-
-                workbook = load_workbook(excel_bytes, data_only=True)
-
-                result = []
-
-                for sheet_name in workbook.sheetnames:
-                    sheet = workbook[sheet_name]
-                    result.append(f"\nSheet: {sheet_name}")
-                    result.append(" \n\n")
-
-                    rows_data = []
-                    for row in sheet.iter_rows(values_only=True):
-                        if any(cell is not None for cell in row):  # Skip empty rows
-                            rows_data.append(
-                                [str(cell) if cell is not None else "" for cell in row]
-                            )
-
-                    if not rows_data:
-                        result.append("(Empty sheet)")
-                        continue
-
-                    # Add headers and data
-                    headers = rows_data[0] if rows_data else []
-                    result.append("Headers: " + " | ".join(headers))
-                    result.append(" \n\n")
-
-                    for i, row in enumerate(rows_data[1:], 1):
-                        if len(row) == len(headers):
-                            row_data = [f"{h}: {v}" for h, v in zip(headers, row)]
-                            result.append(f"Row {i}: {' | '.join(row_data)}")
-                            result.append(" \n\n")
-                        else:
-                            result.append(f"Row {i}: {' | '.join(row)}")
-                            result.append(" \n\n")
-
-                return "\n".join(result)
-
-        except Exception as e:
-            raise ValueError(f"Error reading Excel file: {str(e)}")
+        return await run_in_process_pool(parse_excel, decoded_bytes, extension)
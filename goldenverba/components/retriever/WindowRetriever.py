@@ -1,6 +1,48 @@
+import re
+from functools import lru_cache
+
+from wasabi import msg
+
 from goldenverba.components.interfaces import Retriever
 from goldenverba.components.types import InputConfig
 
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+# Tokens of the "Chunk:" and "High Relevancy:" lines written before every chunk
+CHUNK_HEADER_TOKENS = 12
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    """Encoding used for context budgets, loaded once and None if it is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+    except Exception as e:
+        msg.warn(f"Could not load tiktoken encoding, estimating tokens: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def trim_overlap(previous: str, content: str, max_words: int = 256) -> str:
+    """Remove the start of content that repeats the end of the previous chunk (chunk overlap)"""
+    previous_words = previous.split()
+    words = list(re.finditer(r"\S+", content))
+    for size in range(min(len(previous_words), len(words) - 1, max_words), 0, -1):
+        if previous_words[-size:] == [word.group() for word in words[:size]]:
+            return content[words[size].start() :]
+    return content
+
 
 class WindowRetriever(Retriever):
     """
@@ -16,7 +58,13 @@ class WindowRetriever(Retriever):
             type="dropdown",
             value="Hybrid Search",
             description="Switch between search types.",
-            values=["Hybrid Search"],
+            values=["Hybrid Search", "Keyword (BM25)", "Vector"],
+        )
+        self.config["Alpha"] = InputConfig(
+            type="number",
+            value=50,
+            description="Weight of vector search in Hybrid Search, 0 is keyword only and 100 is vector only (0-100)",
+            values=[],
         )
         self.config["Limit Mode"] = InputConfig(
             type="dropdown",
@@ -43,6 +91,9 @@ class WindowRetriever(Retriever):
             values=[],
         )
 
+    def requires_vector(self, config) -> bool:
+        return config["Search Mode"].value != "Keyword (BM25)"
+
     async def retrieve(
         self,
         client,
@@ -53,6 +104,7 @@ class WindowRetriever(Retriever):
         embedder,
         labels,
         document_uuids,
+        max_tokens=None,
     ):
         search_mode = config["Search Mode"].value
         limit_mode = config["Limit Mode"].value
@@ -62,7 +114,21 @@ class WindowRetriever(Retriever):
         window_threshold = max(0, min(100, int(config["Threshold"].value)))
         window_threshold /= 100
 
-        if search_mode == "Hybrid Search":
+        if search_mode == "Keyword (BM25)":
+            chunks = await weaviate_manager.keyword_chunks(
+                client,
+                embedder,
+                query,
+                limit_mode,
+                limit,
+                labels,
+                document_uuids,
+            )
+        else:
+            if search_mode == "Vector":
+                alpha = 1.0
+            else:
+                alpha = max(0, min(100, int(config["Alpha"].value))) / 100
             chunks = await weaviate_manager.hybrid_chunks(
                 client,
                 embedder,
@@ -72,20 +138,24 @@ class WindowRetriever(Retriever):
                 limit,
                 labels,
                 document_uuids,
+                alpha=alpha,
             )
-        # TODO Add other search methods
 
         if len(chunks) == 0:
             return ([], "We couldn't find any chunks to the query")
 
+        documents_by_id = await weaviate_manager.get_documents_by_ids(
+            client,
+            [chunk.properties["doc_uuid"] for chunk in chunks],
+            properties=["title", "metadata"],
+        )
+
         # Group Chunks by document and sum score
         doc_map = {}
         scores = [0]
         for chunk in chunks:
             if chunk.properties["doc_uuid"] not in doc_map:
-                document = await weaviate_manager.get_document(
-                    client, chunk.properties["doc_uuid"]
-                )
+                document = documents_by_id.get(str(chunk.properties["doc_uuid"]))
                 if document is None:
                     continue
                 doc_map[chunk.properties["doc_uuid"]] = {
@@ -117,41 +187,50 @@ class WindowRetriever(Retriever):
             # Create a range of values around the given value, excluding the original value
             return [i for i in range(value - window, value + window + 1) if i != value]
 
-        documents = []
-        context_documents = []
-
+        # Collect the window of every document first, so all neighbors are fetched in one query
+        window_chunk_ids = {}
         for doc in doc_map:
             additional_chunk_ids = []
-            chunks_above_threshold = 0
             for chunk in doc_map[doc]["chunks"]:
                 normalized_score = normalize_value(
                     float(chunk["score"]), float(max_score), float(min_score)
                 )
                 if window_threshold <= normalized_score:
-                    chunks_above_threshold += 1
                     additional_chunk_ids += generate_window_list(
                         chunk["chunk_id"], window
                     )
-            unique_chunk_ids = set(additional_chunk_ids)
-
+            # Chunks of the hit list are reused instead of fetched again
+            existing_chunk_ids = set(
+                chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
+            )
+            unique_chunk_ids = set(additional_chunk_ids) - existing_chunk_ids
             if len(unique_chunk_ids) > 0:
-                additional_chunks = await weaviate_manager.get_chunk_by_ids(
-                    client, embedder, doc, unique_chunk_ids
-                )
-                existing_chunk_ids = set(
-                    chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
-                )
-                for chunk in additional_chunks:
-                    if chunk.properties["chunk_id"] not in existing_chunk_ids:
-                        doc_map[doc]["chunks"].append(
-                            {
-                                "uuid": str(chunk.uuid),
-                                "score": 0,
-                                "chunk_id": chunk.properties["chunk_id"],
-                                "content": chunk.properties["content"],
-                            }
-                        )
-                        existing_chunk_ids.add(chunk.properties["chunk_id"])
+                window_chunk_ids[doc] = sorted(unique_chunk_ids)
+
+        additional_chunks_by_document = (
+            await weaviate_manager.get_chunks_by_document_ids(
+                client, embedder, window_chunk_ids
+            )
+        )
+
+        documents = []
+        context_documents = []
+
+        for doc in doc_map:
+            existing_chunk_ids = set(
+                chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
+            )
+            for chunk in additional_chunks_by_document.get(str(doc), []):
+                if chunk.properties["chunk_id"] not in existing_chunk_ids:
+                    doc_map[doc]["chunks"].append(
+                        {
+                            "uuid": str(chunk.uuid),
+                            "score": 0,
+                            "chunk_id": chunk.properties["chunk_id"],
+                            "content": chunk.properties["content"],
+                        }
+                    )
+                    existing_chunk_ids.add(chunk.properties["chunk_id"])
 
             _chunks = [
                 {
@@ -200,22 +279,64 @@ class WindowRetriever(Retriever):
         )
         sorted_documents = sorted(documents, key=lambda x: x["score"], reverse=True)
 
-        context = self.combine_context(sorted_context_documents)
+        context = self.combine_context(sorted_context_documents, max_tokens)
         return (sorted_documents, context)
 
-    def combine_context(self, documents: list[dict]) -> str:
+    def combine_context(self, documents: list[dict], max_tokens: int = None) -> str:
+        """Pack the chunks into the context, best scored first, until max_tokens is reached.
+        Documents keep their order and chunks are written in document order with duplicate and overlapping text removed
+        """
 
-        context = ""
-
-        for document in documents:
-            context += f"Document Title: {document['title']}\n"
+        headers = {}
+        for index, document in enumerate(documents):
+            header = f"Document Title: {document['title']}\n"
             if len(document["metadata"]) > 0:
-                context += f"Document Metadata: {document['metadata']}\n"
-            for chunk in document["chunks"]:
-                context += f"Chunk: {int(chunk['chunk_id'])+1}\n"
+                header += f"Document Metadata: {document['metadata']}\n"
+            headers[index] = header
+
+        # Hits by score first, then window chunks by the score of their document
+        ranked = sorted(
+            (
+                (chunk["score"], document["score"], index, chunk)
+                for index, document in enumerate(documents)
+                for chunk in document["chunks"]
+            ),
+            key=lambda x: (x[0], x[1]),
+            reverse=True,
+        )
+
+        used_tokens = 0
+        seen_content = set()
+        selected = {}
+        for _, _, index, chunk in ranked:
+            if chunk["content"] in seen_content:
+                continue
+            if max_tokens is not None:
+                cost = count_tokens(chunk["content"]) + CHUNK_HEADER_TOKENS
+                if index not in selected:
+                    cost += count_tokens(headers[index])
+                if used_tokens + cost > max_tokens:
+                    continue
+                used_tokens += cost
+            seen_content.add(chunk["content"])
+            selected.setdefault(index, []).append(chunk)
+
+        parts = []
+        for index in sorted(selected):
+            parts.append(headers[index])
+            previous = None
+            for chunk in sorted(selected[index], key=lambda x: x["chunk_id"]):
+                content = chunk["content"]
+                if (
+                    previous is not None
+                    and previous["chunk_id"] + 1 == chunk["chunk_id"]
+                ):
+                    content = trim_overlap(previous["content"], content)
+                parts.append(f"Chunk: {int(chunk['chunk_id'])+1}\n")
                 if chunk["score"] > 0:
-                    context += f"High Relevancy: {chunk['score']:.2f}\n"
-                context += f"{chunk['content']}\n"
-            context += "\n\n"
+                    parts.append(f"High Relevancy: {chunk['score']:.2f}\n")
+                parts.append(f"{content}\n")
+                previous = chunk
+            parts.append("\n\n")
 
-        return context
+        return "".join(parts)
@@ -0,0 +1,112 @@
+import re
+import time
+import random
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+import aiohttp
+from wasabi import msg
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check if a failed embedding request is worth retrying (rate limits, server errors and connection issues)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return True
+    # Most Embedders wrap the response error into a generic Exception
+    message = str(error)
+    return "Rate limit exceeded" in message or bool(
+        re.search(r"(^|\D)(429|5\d\d), message=", message)
+    )
+
+
+class RateLimiter:
+    """
+    Sliding window budget of requests and tokens per minute. A budget of 0 disables the limit.
+    """
+
+    def __init__(
+        self, requests_per_minute: int = 0, tokens_per_minute: int = 0, period=60.0
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.period = period
+        self.events: deque[tuple[float, int]] = deque()
+        self.used_tokens = 0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0):
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.events and now - self.events[0][0] >= self.period:
+                    self.used_tokens -= self.events.popleft()[1]
+
+                fits_requests = (
+                    not self.requests_per_minute
+                    or len(self.events) < self.requests_per_minute
+                )
+                # Requests bigger than the whole budget are let through on an empty window
+                fits_tokens = (
+                    not self.tokens_per_minute
+                    or self.used_tokens + tokens <= self.tokens_per_minute
+                    or not self.events
+                )
+                if fits_requests and fits_tokens:
+                    self.events.append((now, tokens))
+                    self.used_tokens += tokens
+                    return
+
+                await asyncio.sleep(self.period - (now - self.events[0][0]))
+
+
+class EmbeddingScheduler:
+    """
+    Schedules requests to a single embedding provider with a limit of in-flight requests,
+    a requests/tokens per minute budget and retries with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = 4,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrent_requests))
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def estimate_tokens(content: list[str]) -> int:
+        """Rough token estimate (~4 characters per token), cheap enough to run on every batch"""
+        return sum(len(text) for text in content) // 4 + 1
+
+    async def run(self, request: Callable[[], Awaitable], tokens: int = 0):
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                await self.limiter.acquire(tokens)
+                try:
+                    return await request()
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    error = e
+
+            delay = min(self.max_delay, self.base_delay * 2**attempt)
+            delay *= random.uniform(0.5, 1.0)
+            attempt += 1
+            msg.warn(
+                f"Embedding request failed ({str(error)}), retrying in {delay:.2f}s ({attempt}/{self.max_retries})"
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,86 @@
+import os
+import asyncio
+from urllib.parse import urlsplit
+
+import aiohttp
+from wasabi import msg
+
+# Shared by all sessions so connection limits and the DNS cache apply process-wide
+_connector: aiohttp.TCPConnector | None = None
+_sessions: dict[str, aiohttp.ClientSession] = {}
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_session_key(url: str) -> str:
+    """Sessions are pooled per scheme and host, paths of the same provider share connections"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def create_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=int(os.getenv("VERBA_HTTP_POOL_SIZE", 100)),
+        limit_per_host=int(os.getenv("VERBA_HTTP_POOL_SIZE_PER_HOST", 20)),
+        ttl_dns_cache=int(os.getenv("VERBA_HTTP_DNS_CACHE_TTL", 300)),
+        keepalive_timeout=float(os.getenv("VERBA_HTTP_KEEPALIVE_TIMEOUT", 30)),
+    )
+
+
+def start_http_sessions():
+    """Create the shared connection pool on the running event loop"""
+    global _connector, _loop
+    loop = asyncio.get_running_loop()
+    if _connector is None or _connector.closed or _loop is not loop:
+        detach_http_sessions()
+        _connector = create_connector()
+        _loop = loop
+
+
+def detach_http_sessions():
+    """Release the sessions of a previous event loop, which can't be awaited from the running one"""
+    for session in _sessions.values():
+        # Sessions don't own the shared connector, detaching is all their close does
+        session.detach()
+    _sessions.clear()
+    if (
+        _connector is not None
+        and not _connector.closed
+        and _loop is not None
+        and not _loop.is_closed()
+    ):
+        asyncio.run_coroutine_threadsafe(close_connector(_connector), _loop)
+
+
+async def close_connector(connector: aiohttp.TCPConnector):
+    await connector.close()
+
+
+def get_http_session(url: str) -> aiohttp.ClientSession:
+    """Return the pooled session for the host of url, sessions must not be closed by the caller"""
+    if (
+        _connector is None
+        or _connector.closed
+        or _loop is not asyncio.get_running_loop()
+    ):
+        # Outside of the server (e.g. scripts or tests) the pool is created on first use
+        start_http_sessions()
+
+    key = get_session_key(url)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(connector=_connector, connector_owner=False)
+        _sessions[key] = session
+    return session
+
+
+async def close_http_sessions():
+    global _connector, _loop
+    for session in _sessions.values():
+        if not session.closed:
+            await session.close()
+    _sessions.clear()
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
+        msg.info("Closed shared HTTP sessions")
+    _connector = None
+    _loop = None
@@ -0,0 +1,69 @@
+import time
+from collections import Counter
+
+
+class CorpusStatistics:
+    """
+    In-memory statistics of the documents of one Weaviate cluster (labels, documents and chunks).
+    Maintained on import and delete and rebuilt from Weaviate by WeaviateManager.reconcile_statistics.
+    """
+
+    def __init__(self):
+        # doc_uuid -> {"labels": list[str], "embedder": str, "chunks": int}
+        self.documents: dict[str, dict] = {}
+        self.label_counts: Counter = Counter()
+        self.total_chunks = 0
+        self.reconciled_at = time.monotonic()
+
+    def add_document(self, uuid: str, labels: list[str], embedder: str, chunks: int):
+        uuid = str(uuid)
+        self.remove_document(uuid)
+        labels = list(dict.fromkeys(labels or []))
+        self.documents[uuid] = {
+            "labels": labels,
+            "embedder": embedder,
+            "chunks": chunks,
+        }
+        self.label_counts.update(labels)
+        self.total_chunks += chunks
+
+    def remove_document(self, uuid: str):
+        document = self.documents.pop(str(uuid), None)
+        if document is not None:
+            self.label_counts.subtract(document["labels"])
+            self.label_counts = +self.label_counts
+            self.total_chunks -= document["chunks"]
+
+    def get_labels(self) -> list[str]:
+        return sorted(self.label_counts)
+
+    def get_label_counts(self) -> dict[str, int]:
+        return dict(self.label_counts)
+
+    def get_document_count(
+        self,
+        embedder: str | None = None,
+        document_uuids: list[str] | None = None,
+        labels: list[str] | None = None,
+    ) -> int:
+        if not embedder and not document_uuids and not labels:
+            return len(self.documents)
+        documents = (
+            [self.documents.get(str(uuid)) for uuid in document_uuids]
+            if document_uuids
+            else self.documents.values()
+        )
+        return sum(
+            1
+            for document in documents
+            if document is not None
+            and (not embedder or document["embedder"] == embedder)
+            and (not labels or all(label in document["labels"] for label in labels))
+        )
+
+    def get_chunk_count(self, uuid: str) -> int | None:
+        document = self.documents.get(str(uuid))
+        return document["chunks"] if document is not None else None
+
+    def is_stale(self, max_age: float) -> bool:
+        return time.monotonic() - self.reconciled_at > max_age
@@ -0,0 +1,88 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
+
+def normalize_timestamp(timestamp) -> str:
+    """ISO timestamp in UTC, so timestamps of Weaviate and of this process compare correctly"""
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        except ValueError:
+            return timestamp
+    if isinstance(timestamp, datetime):
+        # Naive timestamps were written with datetime.now(), in local time
+        return timestamp.astimezone(timezone.utc).isoformat()
+    return str(timestamp)
+
+
+class SuggestionIndex:
+    """
+    In-memory prefix index of the suggestions of one Weaviate cluster for autocomplete.
+    Queries are kept in a sorted array of their lower case form, completions are ranked by frequency and recency.
+    Spellings of the same query that only differ in case share one entry, but keep their own uuid.
+    """
+
+    def __init__(self):
+        self.keys: list[str] = []
+        # lower case query -> {"count": int, "queries": {query: {"uuid": str, "timestamp": str}}}
+        self.suggestions: dict[str, dict] = {}
+        # uuid -> (lower case query, query)
+        self.queries_by_uuid: dict[str, tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.queries_by_uuid)
+
+    def add(self, query: str, timestamp, uuid: str, count: int = 1):
+        """Add a suggestion, a known query counts as another use and keeps its uuid"""
+        timestamp = normalize_timestamp(timestamp)
+        key = query.lower()
+        suggestion = self.suggestions.get(key)
+        if suggestion is None:
+            insort(self.keys, key)
+            suggestion = {"count": 0, "queries": {}}
+            self.suggestions[key] = suggestion
+        suggestion["count"] += count
+
+        variant = suggestion["queries"].get(query)
+        if variant is None:
+            suggestion["queries"][query] = {"uuid": str(uuid), "timestamp": timestamp}
+            self.queries_by_uuid[str(uuid)] = (key, query)
+        else:
+            variant["timestamp"] = max(variant["timestamp"], timestamp)
+
+    def remove(self, uuid: str) -> str | None:
+        """Remove a suggestion by uuid, returns its query"""
+        entry = self.queries_by_uuid.pop(str(uuid), None)
+        if entry is None:
+            return None
+        key, query = entry
+        suggestion = self.suggestions[key]
+        del suggestion["queries"][query]
+        if not suggestion["queries"]:
+            del self.suggestions[key]
+            del self.keys[bisect_left(self.keys, key)]
+        return query
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        matches = []
+        for key in self.keys[start:end]:
+            suggestion = self.suggestions[key]
+            # The most recently used spelling represents the query
+            query, variant = max(
+                suggestion["queries"].items(), key=lambda x: x[1]["timestamp"]
+            )
+            matches.append((suggestion["count"], variant["timestamp"], query, variant))
+        return [
+            {
+                "query": query,
+                "timestamp": timestamp,
+                "uuid": variant["uuid"],
+            }
+            for _, timestamp, query, variant in heapq.nlargest(
+                limit, matches, key=lambda x: (x[0], x[1])
+            )
+        ]
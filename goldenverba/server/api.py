@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 import asyncio
 
-from goldenverba.server.helpers import LoggerManager, BatchManager
+from goldenverba.server.helpers import LoggerManager, BatchManager, JobManager
 from weaviate.client import WeaviateAsyncClient
 
 import os
@@ -16,6 +16,13 @@ from starlette.websockets import WebSocketDisconnect
 from wasabi import msg  # type: ignore[import]
 
 from goldenverba import verba_manager
+from goldenverba.components.document import warm_nlp_pipelines
+from goldenverba.components.reader.parsers import (
+    start_process_pool,
+    shutdown_process_pool,
+)
+from goldenverba.components.sessions import start_http_sessions, close_http_sessions
+from goldenverba.components.projection import encode_vector_groups
 
 from goldenverba.server.types import (
     ResetPayload,
@@ -37,6 +44,7 @@ from goldenverba.server.types import (
     GetVectorPayload,
     DataBatchPayload,
     ChunksPayload,
+    GetJobPayload,
 )
 
 load_dotenv()
@@ -56,13 +64,27 @@ manager = verba_manager.VerbaManager()
 
 client_manager = verba_manager.ClientManager()
 
+job_manager = JobManager()
+
 ### Lifespan
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    start_process_pool()
+    start_http_sessions()
+    warm_nlp_pipelines(
+        [
+            language
+            for language in os.getenv("VERBA_NLP_WARMUP", "en").split(",")
+            if language
+        ]
+    )
+    await manager.embedder_manager.warm_up()
     yield
     await client_manager.disconnect()
+    await close_http_sessions()
+    shutdown_process_pool()
 
 
 # FastAPI App
@@ -516,9 +538,11 @@ async def get_labels(payload: Credentials):
     try:
         client = await client_manager.connect(payload)
         labels = await manager.weaviate_manager.get_labels(client)
+        label_counts = await manager.weaviate_manager.get_label_counts(client)
         return JSONResponse(
             content={
                 "labels": labels,
+                "label_counts": label_counts,
             }
         )
     except Exception as e:
@@ -526,6 +550,7 @@ async def get_labels(payload: Credentials):
         return JSONResponse(
             content={
                 "labels": [],
+                "label_counts": {},
             }
         )
 
@@ -557,9 +582,19 @@ async def get_content(payload: GetContentPayload):
 async def get_vectors(payload: GetVectorPayload):
     try:
         client = await client_manager.connect(payload.credentials)
+        max_points = (
+            payload.maxPoints
+            if payload.maxPoints is not None
+            else int(os.getenv("VERBA_MAX_VECTOR_POINTS", 20000))
+        )
         vector_groups = await manager.weaviate_manager.get_vectors(
-            client, payload.uuid, payload.showAll
+            client, payload.uuid, payload.showAll, max_points
         )
+        if vector_groups is not None and payload.encoding == "float16":
+            vector_groups = {
+                **vector_groups,
+                **encode_vector_groups(vector_groups["groups"]),
+            }
         return JSONResponse(
             content={
                 "error": "",
@@ -688,24 +723,49 @@ async def reset_verba(payload: ResetPayload):
 
     try:
         client = await client_manager.connect(payload.credentials)
-        if payload.resetMode == "ALL":
-            await manager.weaviate_manager.delete_all(client)
-        elif payload.resetMode == "DOCUMENTS":
-            await manager.weaviate_manager.delete_all_documents(client)
-        elif payload.resetMode == "CONFIG":
-            await manager.weaviate_manager.delete_all_configs(client)
-        elif payload.resetMode == "SUGGESTIONS":
-            await manager.weaviate_manager.delete_all_suggestions(client)
+
+        async def reset(progress):
+            if payload.resetMode == "ALL":
+                await manager.weaviate_manager.delete_all(client, progress)
+            elif payload.resetMode == "DOCUMENTS":
+                await manager.weaviate_manager.delete_all_documents(client, progress)
+            elif payload.resetMode == "CONFIG":
+                await manager.weaviate_manager.delete_all_configs(client)
+            elif payload.resetMode == "SUGGESTIONS":
+                await manager.weaviate_manager.delete_all_suggestions(client)
 
         msg.info(f"Resetting Verba in ({payload.resetMode}) mode")
+        job_id = job_manager.start_job(
+            f"Reset {payload.resetMode}", reset, owner=payload.credentials.url
+        )
 
-        return JSONResponse(status_code=200, content={})
+        # Without background, keep answering once the reset is done
+        if not payload.background:
+            job = await job_manager.wait_for_job(job_id)
+            if job["status"] == "ERROR":
+                raise Exception(job["error"])
+
+        return JSONResponse(status_code=200, content={"job_id": job_id})
 
     except Exception as e:
         msg.warn(f"Failed to reset Verba {str(e)}")
         return JSONResponse(status_code=500, content={})
 
 
+@app.post("/api/get_job")
+async def get_job(payload: GetJobPayload):
+    try:
+        await client_manager.connect(payload.credentials)
+    except Exception as e:
+        msg.warn(f"Failed to get job {payload.job_id}: {str(e)}")
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    job = job_manager.get_job(payload.job_id, owner=payload.credentials.url)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    return JSONResponse(status_code=200, content=job)
+
+
 # Get Status meta data
 @app.post("/api/get_meta")
 async def get_meta(payload: Credentials):
@@ -719,6 +779,7 @@ async def get_meta(payload: Credentials):
                 "error": "",
                 "node_payload": node_payload,
                 "collection_payload": collection_payload,
+                "cache_payload": manager.get_cache_stats(),
             }
         )
     except Exception as e:
@@ -727,6 +788,7 @@ async def get_meta(payload: Credentials):
                 "error": f"Couldn't retrieve metadata {str(e)}",
                 "node_payload": {},
                 "collection_payload": {},
+                "cache_payload": {},
             }
         )
 
@@ -1,3 +1,8 @@
+import time
+import uuid
+import asyncio
+from typing import Awaitable, Callable
+
 from fastapi import WebSocket
 from goldenverba.server.types import (
     FileStatus,
@@ -77,3 +82,73 @@ class BatchManager:
             return FileConfig.model_validate_json(data)
         else:
             return None
+
+
+class JobManager:
+    """Runs long admin tasks (e.g. resets) in the background and keeps their progress for polling"""
+
+    def __init__(self, max_jobs: int = 100):
+        self.jobs: dict[str, dict] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+        # Jobs are only visible to the Weaviate cluster they were started for
+        self.owners: dict[str, str] = {}
+        self.max_jobs = max_jobs
+
+    def start_job(
+        self,
+        name: str,
+        run: Callable[[Callable[[int, int], Awaitable]], Awaitable],
+        owner: str = "",
+    ) -> str:
+        """Start run(progress) as a task, progress(completed, total) updates the job"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "name": name,
+            "status": "RUNNING",
+            "completed": 0,
+            "total": 0,
+            "error": "",
+            "took": 0,
+        }
+        start_time = time.monotonic()
+
+        async def progress(completed: int, total: int):
+            job["completed"] = completed
+            job["total"] = total
+            job["took"] = round(time.monotonic() - start_time, 2)
+
+        async def run_job():
+            try:
+                await run(progress)
+                job["status"] = "DONE"
+            except Exception as e:
+                msg.fail(f"Job {name} failed: {str(e)}")
+                job["status"] = "ERROR"
+                job["error"] = str(e)
+            finally:
+                job["took"] = round(time.monotonic() - start_time, 2)
+                self.tasks.pop(job_id, None)
+
+        self.jobs[job_id] = job
+        self.owners[job_id] = owner
+        self.tasks[job_id] = asyncio.create_task(run_job())
+        while len(self.jobs) > self.max_jobs:
+            oldest = next(iter(self.jobs))
+            if oldest in self.tasks:
+                break
+            del self.jobs[oldest]
+            del self.owners[oldest]
+        return job_id
+
+    async def wait_for_job(self, job_id: str) -> dict:
+        task = self.tasks.get(job_id)
+        if task is not None:
+            # A cancelled request (e.g. a client disconnect) must not cancel the job
+            await asyncio.shield(task)
+        return self.jobs[job_id]
+
+    def get_job(self, job_id: str, owner: str = "") -> dict | None:
+        if self.owners.get(job_id) != owner:
+            return None
+        return self.jobs.get(job_id)
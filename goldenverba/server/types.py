@@ -31,6 +31,8 @@ class GetVectorPayload(BaseModel):
     uuid: str
     showAll: bool
     credentials: Credentials
+    maxPoints: int | None = None
+    encoding: str = "json"
 
 
 class ConnectPayload(BaseModel):
@@ -257,3 +259,9 @@ class GetDocumentPayload(BaseModel):
 class ResetPayload(BaseModel):
     resetMode: str
     credentials: Credentials
+    background: bool = False
+
+
+class GetJobPayload(BaseModel):
+    job_id: str
+    credentials: Credentials
@@ -0,0 +1,51 @@
+import time
+
+from goldenverba.components.cache import LRUCache, hash_content
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_ttl_expiry():
+    """Test that entries older than the ttl are treated as misses"""
+    cache = LRUCache(max_size=10, ttl=0.01)
+    cache.put("query", [0.1, 0.2])
+    assert cache.get("query") == [0.1, 0.2]
+    time.sleep(0.02)
+    assert cache.get("query") is None
+    assert cache.stats() == {"size": 0, "max_size": 10, "hits": 1, "misses": 1}
+
+
+def test_contains_respects_ttl():
+    """Test that membership agrees with get for expired entries"""
+    cache = LRUCache(max_size=10, ttl=0.01)
+    cache.put("query", [0.1, 0.2])
+    assert "query" in cache
+    time.sleep(0.02)
+    assert "query" not in cache
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_disabled_cache():
+    """Test that a max_size of 0 disables the cache"""
+    cache = LRUCache(max_size=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_hash_content():
+    """Test that the content hash is stable and content sensitive"""
+    assert hash_content("Verba") == hash_content("Verba")
+    assert hash_content("Verba") != hash_content("verba")
@@ -0,0 +1,266 @@
+import re
+import asyncio
+from uuid import uuid4
+from types import SimpleNamespace
+
+import pytest
+
+
+def tokenize(text: str) -> set[str]:
+    return set(re.findall(r"\w+", str(text).lower()))
+
+
+def matches(uuid, obj: dict, filters) -> bool:
+    """Equal and ContainsAny filters compare exact values, other filters match everything"""
+    operator = getattr(getattr(filters, "operator", None), "name", None)
+    if operator not in ("EQUAL", "CONTAINS_ANY"):
+        return True
+    value = str(uuid) if filters.target == "_id" else obj.get(filters.target)
+    if operator == "EQUAL":
+        return value == filters.value
+    return value in filters.value
+
+
+class FakeConfig:
+    def __init__(self, properties: list[str]):
+        self.properties = [SimpleNamespace(name=name) for name in properties]
+
+    async def get(self):
+        return SimpleNamespace(properties=self.properties)
+
+    async def add_property(self, prop):
+        self.properties.append(prop)
+
+
+class FakeCollection:
+    """
+    In-memory Weaviate collection, serves as its own query and data namespace.
+    BM25 matches all query tokens and ranks shorter values first.
+    """
+
+    def __init__(
+        self,
+        collections: "FakeCollections",
+        objects: dict[str, dict],
+        properties: list[str] | None = None,
+    ):
+        self.collections = collections
+        self.objects = dict(objects)
+        if properties is None:
+            properties = list(
+                dict.fromkeys(prop for obj in self.objects.values() for prop in obj)
+            )
+        self.config = FakeConfig(properties)
+        self.query = self
+        self.data = self
+        self.calls = 0
+        self.inserts = []
+        # Queries or contents rejected by insert_many and the number of insert_many calls that raise
+        self.rejected = set()
+        self.fail = 0
+        self.delay = 0.01
+        # Like QUERY_MAXIMUM_RESULTS, the most objects one delete_many removes
+        self.max_results = 10000
+        # uuid -> vector and the number of vectors returned by queries
+        self.vectors = {}
+        self.vectors_fetched = 0
+
+    def values(self, prop: str) -> list:
+        return [obj.get(prop) for obj in self.objects.values()]
+
+    def to_object(
+        self, uuid, properties: dict, return_properties=None, include_vector=False
+    ):
+        if return_properties is not None:
+            properties = {prop: properties.get(prop) for prop in return_properties}
+        vector = {}
+        if include_vector and uuid in self.vectors:
+            vector = {"default": self.vectors[uuid]}
+            self.vectors_fetched += 1
+        return SimpleNamespace(uuid=uuid, properties=dict(properties), vector=vector)
+
+    async def fetch_objects(
+        self,
+        limit=None,
+        offset=0,
+        after=None,
+        filters=None,
+        return_properties=None,
+        sort=None,
+        include_vector=False,
+    ):
+        self.calls += 1
+        uuids = [
+            uuid for uuid, obj in self.objects.items() if matches(uuid, obj, filters)
+        ]
+        if after is not None:
+            uuids = uuids[uuids.index(after) + 1 :]
+        uuids = uuids[offset:]
+        if limit is not None:
+            uuids = uuids[:limit]
+        return SimpleNamespace(
+            objects=[
+                self.to_object(
+                    uuid, self.objects[uuid], return_properties, include_vector
+                )
+                for uuid in uuids
+            ]
+        )
+
+    async def fetch_object_by_id(self, uuid):
+        if uuid not in self.objects:
+            return None
+        return self.to_object(uuid, self.objects[uuid])
+
+    async def bm25(self, query, query_properties, filters, limit, return_properties):
+        self.calls += 1
+        prop = query_properties[0]
+        matches = sorted(
+            (
+                (uuid, obj)
+                for uuid, obj in self.objects.items()
+                if tokenize(query) <= tokenize(obj.get(prop, ""))
+            ),
+            key=lambda x: len(x[1][prop]),
+        )
+        return SimpleNamespace(
+            objects=[
+                self.to_object(uuid, obj, return_properties)
+                for uuid, obj in matches[:limit]
+            ]
+        )
+
+    async def iterator(self, return_properties=None):
+        self.calls += 1
+        for uuid, obj in list(self.objects.items()):
+            await asyncio.sleep(0)
+            yield self.to_object(uuid, obj, return_properties)
+
+    async def length(self):
+        self.collections.running += 1
+        self.collections.peak = max(self.collections.peak, self.collections.running)
+        await asyncio.sleep(self.delay)
+        self.collections.running -= 1
+        return len(self.objects)
+
+    async def exists(self, uuid) -> bool:
+        return uuid in self.objects
+
+    async def insert(self, properties, uuid=None):
+        uuid = uuid or str(uuid4())
+        if uuid in self.objects:
+            raise Exception(f"Object {uuid} already exists")
+        self.objects[uuid] = dict(properties)
+        return uuid
+
+    async def insert_many(self, objects):
+        if self.fail > 0:
+            self.fail -= 1
+            raise Exception("Weaviate is unavailable")
+        self.inserts.append(objects)
+        errors = {}
+        uuids = {}
+        for i, obj in enumerate(objects):
+            if (
+                obj.properties.get("query") in self.rejected
+                or obj.properties.get("content") in self.rejected
+            ):
+                errors[i] = SimpleNamespace(message="rejected")
+            elif obj.uuid in self.objects:
+                errors[i] = SimpleNamespace(message=f"id '{obj.uuid}' already exists")
+            else:
+                uuids[i] = obj.uuid or str(uuid4())
+                self.objects[uuids[i]] = dict(obj.properties)
+        return SimpleNamespace(has_errors=bool(errors), errors=errors, uuids=uuids)
+
+    async def delete_many(self, where):
+        uuids = [
+            uuid for uuid, obj in self.objects.items() if matches(uuid, obj, where)
+        ]
+        for uuid in uuids[: self.max_results]:
+            del self.objects[uuid]
+        deleted = min(len(uuids), self.max_results)
+        return SimpleNamespace(matches=deleted, successful=deleted, failed=0)
+
+    async def replace(self, uuid, properties):
+        if uuid not in self.objects:
+            raise Exception(f"Object {uuid} not found")
+        self.objects[uuid] = dict(properties)
+
+    async def update(self, uuid, properties):
+        self.objects[uuid].update(properties)
+
+    async def delete_by_id(self, uuid) -> bool:
+        return self.objects.pop(uuid, None) is not None
+
+
+class FakeCollections:
+    """Collections of a fake Weaviate cluster, calls counts the schema requests"""
+
+    def __init__(self, collections: dict[str, dict[str, dict]]):
+        self.collections = {}
+        self.configs = {}
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+        for name, objects in collections.items():
+            self.collections[name] = FakeCollection(self, objects)
+
+    @property
+    def names(self) -> set[str]:
+        return set(self.collections)
+
+    def get(self, name: str) -> FakeCollection:
+        if name not in self.collections:
+            # Like Weaviate, a handle can be taken before the collection exists
+            return FakeCollection(self, {})
+        return self.collections[name]
+
+    async def list_all(self, simple: bool = True):
+        self.calls += 1
+        return {name: None for name in self.collections}
+
+    async def exists(self, name: str) -> bool:
+        self.calls += 1
+        return name in self.collections
+
+    async def create(self, name: str, properties=None, **config):
+        self.calls += 1
+        collection = FakeCollection(self, {}, [])
+        collection.config.properties = list(properties or [])
+        self.collections[name] = collection
+        self.configs[name] = config
+        return True
+
+    async def delete(self, name: str):
+        self.collections.pop(name, None)
+
+
+class FakeCluster:
+    async def nodes(self, output: str):
+        return [SimpleNamespace(status="HEALTHY", shards=[], version="1.26", name="n")]
+
+
+class FakeClient:
+    def __init__(self, collections: dict[str, dict[str, dict]]):
+        self.cluster = FakeCluster()
+        self.collections = FakeCollections(collections)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def weaviate_client():
+    """Create an in-memory Weaviate client from collection name -> {uuid: properties}"""
+
+    def create(
+        collections: dict[str, dict[str, dict]] | None = None,
+        properties: dict[str, list[str]] | None = None,
+    ) -> FakeClient:
+        client = FakeClient(collections or {})
+        for name, names in (properties or {}).items():
+            client.collections.get(name).config = FakeConfig(names)
+        return client
+
+    return create
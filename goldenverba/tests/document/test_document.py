@@ -1,5 +1,10 @@
 import pytest
-from goldenverba.components.document import Document, create_document
+from goldenverba.components.document import (
+    Document,
+    create_document,
+    load_nlp_for_language,
+    process_spacy_docs,
+)
 from goldenverba.server.types import FileConfig
 
 
@@ -70,6 +75,50 @@ def test_document_with_large_content():
     assert hasattr(doc, "spacy_doc")
 
 
+def test_lazy_spacy_doc():
+    """Test that the spaCy Doc is only processed on first access and can be released"""
+    doc = Document(content="First sentence. Second sentence.")
+    assert doc._spacy_doc is None
+
+    assert len(list(doc.spacy_doc.sents)) == 2
+    assert doc._spacy_doc is not None
+
+    doc.release_spacy_doc()
+    assert doc._spacy_doc is None
+
+
+def test_shared_nlp_pipeline():
+    """Test that spaCy pipelines are built once per language and batched processing matches"""
+    assert load_nlp_for_language("en") is load_nlp_for_language("en")
+    assert load_nlp_for_language("unknown") is load_nlp_for_language("en")
+
+    documents = [
+        Document(content="This is the first document. It has two sentences."),
+        Document(content="This is the second document."),
+    ]
+    process_spacy_docs(documents)
+    assert all(document._spacy_doc is not None for document in documents)
+    assert len(list(documents[0].spacy_doc.sents)) == 2
+    assert documents[1].spacy_doc.text == "This is the second document."
+
+
+def test_nlp_pipeline_counts_documents():
+    """Test that the pipeline reload counter counts processed documents, not pipe calls"""
+    from goldenverba.components import document as document_module
+
+    def uses():
+        return sum(entry[1] for entry in document_module._nlp_pipelines.values())
+
+    before = uses()
+    process_spacy_docs(
+        [
+            Document(content=f"This is the content of document number {i}.")
+            for i in range(3)
+        ]
+    )
+    assert uses() == before + 3
+
+
 def test_invalid_json_document():
     """Test document creation from invalid JSON"""
     invalid_dict = {"title": "Test"}  # Missing required fields
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from goldenverba.components.cache import hash_content
+from goldenverba.components.managers import EmbeddingManager, WeaviateManager
+
+
+class FakeWeaviateManager:
+    def __init__(self, stored: dict[str, list[float]]):
+        self.stored = stored
+        self.lookups = []
+
+    async def get_cached_vectors(self, client, embedder, hashes):
+        self.lookups.append(hashes)
+        return {_hash: self.stored[_hash] for _hash in hashes if _hash in self.stored}
+
+    async def add_cached_vectors(self, client, embedder, vectors):
+        self.stored.update(vectors)
+
+
+def test_batch_vectorize_cache():
+    """Test that memory and persistent cache hits are not embedded and new vectors are written back"""
+    manager = EmbeddingManager()
+    manager.persist_cache = True
+    config = {"Model": SimpleNamespace(value="model")}
+    weaviate_manager = FakeWeaviateManager({hash_content("stored"): [2.0, 2.0]})
+    manager.embedding_cache.put(
+        ("Embedder", "model", hash_content("memory")), np.asarray([1.0, 1.0])
+    )
+    embedded = []
+
+    async def vectorize_batches(embedder, config, content, progress=None):
+        embedded.append(content)
+        return [[float(len(text)), 0.0] for text in content]
+
+    manager.vectorize_batches = vectorize_batches
+
+    async def run():
+        return await manager.batch_vectorize(
+            "Embedder",
+            config,
+            ["new", "memory", "stored", "new"],
+            client=object(),
+            weaviate_manager=weaviate_manager,
+        )
+
+    vectors = asyncio.run(run())
+    assert vectors == [[3.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 0.0]]
+    assert embedded == [["new"]]
+    assert weaviate_manager.lookups == [[hash_content("new"), hash_content("stored")]]
+    assert weaviate_manager.stored[hash_content("new")] == [3.0, 0.0]
+
+    assert asyncio.run(run()) == vectors
+    assert embedded == [["new"]]
+    assert len(weaviate_manager.lookups) == 1
+
+
+def test_cache_collection_uses_flat_index():
+    """Test that the embedding cache collection is created without HNSW index and vectorizer"""
+
+    class FakeCollections:
+        def __init__(self):
+            self.created = {}
+
+        async def list_all(self, simple: bool = True):
+            return {}
+
+        async def exists(self, name: str):
+            return name in self.created
+
+        async def create(self, name: str, properties=None, **config):
+            self.created[name] = config
+            return True
+
+    class FakeClient:
+        collections = FakeCollections()
+
+    client = FakeClient()
+    manager = WeaviateManager()
+    assert asyncio.run(manager.verify_cache_collection(client, "model"))
+    config = client.collections.created["VERBA_Cache_model"]
+    assert config["vector_index_config"].vector_index_type().value == "flat"
+
+
+def test_query_cache_is_case_sensitive():
+    """Test that cached query vectors are shared across whitespace, but not across case"""
+    manager = EmbeddingManager()
+    embedded = []
+
+    class FakeEmbedder:
+        async def vectorize(self, config, content):
+            embedded.extend(content)
+            return [[float(len(embedded))] for _ in content]
+
+    manager.embedders = {"Embedder": FakeEmbedder()}
+    config = {"Model": SimpleNamespace(value="model")}
+    rag_config = {
+        "Embedder": SimpleNamespace(
+            components={"Embedder": SimpleNamespace(config=config)}
+        )
+    }
+
+    async def run():
+        return [
+            await manager.vectorize_query("Embedder", query, rag_config)
+            for query in ["Apple", " Apple  ", "apple"]
+        ]
+
+    assert asyncio.run(run()) == [[1.0], [1.0], [2.0]]
+    assert embedded == ["Apple", "apple"]
@@ -0,0 +1,178 @@
+import json
+import base64
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+from weaviate.util import generate_uuid5
+
+from goldenverba.components.managers import WeaviateManager
+from goldenverba.components.projection import (
+    Projection,
+    encode_vector_groups,
+    sample_vector_groups,
+)
+
+
+def test_projection_is_incremental():
+    """Test that a restored projection continues fitting like the original one"""
+    rng = np.random.default_rng(0)
+    projection = Projection()
+    projection.partial_fit(rng.normal(size=(50, 16)).tolist())
+
+    restored = Projection.from_json(json.loads(json.dumps(projection.to_json())))
+    batch = rng.normal(size=(20, 16)).tolist()
+    projection.partial_fit(batch)
+    restored.partial_fit(batch)
+
+    vectors = rng.normal(size=(5, 16)).tolist()
+    coordinates = projection.transform(vectors)
+    assert len(coordinates[0]) == 3
+    assert np.allclose(coordinates, restored.transform(vectors), atol=1e-4)
+
+
+def test_projection_freezes_after_sample():
+    """Test that the projection stops changing once sample_size vectors were fitted"""
+    rng = np.random.default_rng(1)
+    projection = Projection(sample_size=40)
+    projection.partial_fit(rng.normal(size=(30, 16)).tolist())
+    first_version = projection.version
+    assert first_version != 0 and not projection.frozen
+
+    projection.partial_fit(rng.normal(size=(20, 16)).tolist())
+    assert projection.frozen and projection.version != first_version
+
+    vectors = rng.normal(size=(5, 16)).tolist()
+    coordinates = projection.transform(vectors)
+    version = projection.version
+    projection.partial_fit(rng.normal(size=(50, 16)).tolist())
+    assert projection.version == version
+    assert np.allclose(projection.transform(vectors), coordinates)
+
+    restored = Projection.from_json(json.loads(json.dumps(projection.to_json())), 40)
+    assert restored.frozen and restored.version == version
+
+
+def test_projection_small_batches():
+    """Test that batches smaller than the number of components are kept until they can be fitted"""
+    projection = Projection()
+    coordinates = projection.fit_transform([[1.0, 2.0, 3.0, 4.0]])
+    assert coordinates == [[1.0, 2.0, 3.0]]
+    assert not projection.fitted
+
+    projection.fit_transform([[0.0, 1.0, 0.0, 1.0], [2.0, 0.0, 1.0, 0.0]])
+    assert projection.fitted
+    assert projection.pca.n_samples_seen_ == 3
+
+
+def test_sample_vector_groups():
+    """Test that downsampling keeps every document and stays within max_points"""
+    groups = [
+        {
+            "name": name,
+            "chunks": [
+                {
+                    "vector": {"x": i, "y": 0, "z": 0},
+                    "uuid": f"{name}-{i}",
+                    "chunk_id": i,
+                }
+                for i in range(size)
+            ],
+        }
+        for name, size in [("large", 900), ("medium", 95), ("small", 5)]
+    ]
+    sampled = sample_vector_groups(groups, 100)
+    sizes = {group["name"]: len(group["chunks"]) for group in sampled}
+    assert sum(sizes.values()) == 100
+    assert sizes["small"] >= 1 and sizes["large"] > sizes["medium"]
+    assert sample_vector_groups(groups, 0) is groups
+
+
+def test_encode_vector_groups():
+    """Test that the binary encoding round trips the coordinates as float16"""
+    groups = [
+        {
+            "name": "Verba",
+            "chunks": [
+                {"vector": {"x": 0.5, "y": -1.0, "z": 2.0}, "uuid": "a", "chunk_id": 0},
+                {"vector": {"x": 1.5, "y": 0.25, "z": 0.0}, "uuid": "b", "chunk_id": 1},
+            ],
+        }
+    ]
+    encoded = encode_vector_groups(groups)
+    coordinates = np.frombuffer(
+        base64.b64decode(encoded["coordinates"]), dtype="<f2"
+    ).reshape(-1, 3)
+    assert coordinates.tolist() == [[0.5, -1.0, 2.0], [1.5, 0.25, 0.0]]
+    assert encoded["groups"] == [{"name": "Verba", "offset": 0, "count": 2}]
+    assert encoded["uuids"] == ["a", "b"]
+
+
+def test_stale_coordinates_are_projected_again():
+    """Test that only chunks projected with another version of the projection are projected again"""
+
+    class FakeClient:
+        pass
+
+    rng = np.random.default_rng(2)
+    projection = Projection(sample_size=10)
+    projection.partial_fit(rng.normal(size=(10, 8)).tolist())
+    manager = WeaviateManager()
+    client = FakeClient()
+    manager.projections[client] = {"model": projection}
+
+    vector = rng.normal(size=8).tolist()
+    items = [
+        SimpleNamespace(
+            uuid="fresh",
+            properties={"pca": [1, 2, 3], "pca_version": projection.version},
+            vector={"default": vector},
+        ),
+        SimpleNamespace(
+            uuid="stale",
+            properties={"pca": [1, 2, 3], "pca_version": 1},
+            vector={"default": vector},
+        ),
+    ]
+    coordinates = asyncio.run(manager.get_chunk_coordinates(client, "model", items))
+    assert coordinates["fresh"] == [1, 2, 3]
+    assert np.allclose(coordinates["stale"], projection.transform([vector])[0])
+
+
+def test_document_vectors_fetch_only_stale_vectors(weaviate_client):
+    """Test that the coordinates of a document only fetch vectors of stale chunks and one sample"""
+    rng = np.random.default_rng(3)
+    projection = Projection(sample_size=10)
+    projection.partial_fit(rng.normal(size=(10, 8)).tolist())
+    doc = generate_uuid5("Verba")
+    chunks = {
+        generate_uuid5(f"chunk-{i}"): {
+            "doc_uuid": doc,
+            "chunk_id": i,
+            "pca": [i, i, i],
+            "pca_version": projection.version if i < 3 else 1,
+        }
+        for i in range(4)
+    }
+    client = weaviate_client(
+        {
+            "VERBA_DOCUMENTS": {doc: {"title": "Verba", "embedder": "model"}},
+            "VERBA_Embedding_model": chunks,
+        }
+    )
+    collection = client.collections.get("VERBA_Embedding_model")
+    collection.vectors = {uuid: rng.normal(size=8).tolist() for uuid in chunks}
+    manager = WeaviateManager()
+    manager.projections[client] = {"model": projection}
+
+    vectors = asyncio.run(manager.get_vectors(client, doc, False))
+    assert vectors["dimensions"] == 8
+    assert vectors["total_points"] == 4
+    assert collection.vectors_fetched == 2
+    points = {
+        chunk["uuid"]: chunk["vector"] for chunk in vectors["groups"][0]["chunks"]
+    }
+    assert points[generate_uuid5("chunk-0")] == {"x": 0, "y": 0, "z": 0}
+    stale = generate_uuid5("chunk-3")
+    projected = projection.transform([collection.vectors[stale]])[0]
+    assert np.allclose(list(points[stale].values()), projected)
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from goldenverba.components.scheduler import (
+    EmbeddingScheduler,
+    RateLimiter,
+    is_retryable,
+)
+
+
+def test_retryable_errors():
+    """Test which errors are retried by the scheduler"""
+    assert is_retryable(Exception("Rate limit exceeded. Waiting before retrying..."))
+    assert is_retryable(
+        Exception("API request failed: 503, message='Service Unavailable'")
+    )
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(
+        Exception("API request failed: 401, message='Unauthorized'")
+    )
+    assert not is_retryable(ValueError("Mismatch in embedding count"))
+
+
+def test_scheduler_limits_concurrency():
+    """Test that no more than max_concurrent_requests run at the same time"""
+    scheduler = EmbeddingScheduler(max_concurrent_requests=2)
+    running = 0
+    peak = 0
+
+    async def request():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return True
+
+    async def run():
+        return await asyncio.gather(*[scheduler.run(request) for _ in range(6)])
+
+    assert asyncio.run(run()) == [True] * 6
+    assert peak == 2
+
+
+def test_scheduler_retries_rate_limits():
+    """Test that 429 errors are retried and other errors are raised"""
+    scheduler = EmbeddingScheduler(max_retries=3, base_delay=0.001)
+    calls = 0
+
+    async def flaky_request():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise Exception("Rate limit exceeded. Waiting before retrying...")
+        return [[0.1, 0.2]]
+
+    assert asyncio.run(scheduler.run(flaky_request)) == [[0.1, 0.2]]
+    assert calls == 3
+
+    async def failing_request():
+        raise ValueError("Invalid input")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.run(failing_request))
+
+
+def test_rate_limiter_budget():
+    """Test that the limiter waits once the requests per minute budget is used up"""
+    limiter = RateLimiter(requests_per_minute=2, period=0.05)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await limiter.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.04
@@ -0,0 +1,29 @@
+import asyncio
+
+from goldenverba.components.embedding.SentenceTransformersEmbedder import (
+    MicroBatcher,
+)
+
+
+def test_micro_batcher_merges_requests():
+    """Test that concurrent requests are encoded together and split back in order"""
+    calls = []
+
+    def encode(content: list[str]) -> list[list[float]]:
+        calls.append(len(content))
+        return [[float(len(text))] for text in content]
+
+    batcher = MicroBatcher(encode, max_batch_size=10)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(["a"] * 4),
+            batcher.submit(["bb"]),
+            batcher.submit(["ccc"] * 8),
+        )
+
+    first, second, third = asyncio.run(run())
+    assert first == [[1.0]] * 4
+    assert second == [[2.0]]
+    assert third == [[3.0]] * 8
+    assert calls == [5, 8]
@@ -0,0 +1,46 @@
+import asyncio
+
+from goldenverba.components.sessions import (
+    close_http_sessions,
+    get_http_session,
+    start_http_sessions,
+)
+
+
+def test_sessions_are_pooled_per_host():
+    """Test that requests to the same host reuse one session and connection pool"""
+
+    async def run():
+        start_http_sessions()
+        first = get_http_session("https://api.openai.com/v1")
+        second = get_http_session("https://api.openai.com/v1/embeddings")
+        other = get_http_session("http://localhost:11434")
+        assert first is second
+        assert first is not other
+        assert first.connector is other.connector
+
+        await close_http_sessions()
+        assert first.closed and other.closed
+        assert get_http_session("https://api.openai.com/v1") is not first
+        await close_http_sessions()
+
+    asyncio.run(run())
+
+
+def test_sessions_of_previous_loop_are_released():
+    """Test that a new event loop doesn't leave the sessions of the previous one unclosed"""
+
+    async def start():
+        start_http_sessions()
+        return get_http_session("https://api.openai.com/v1")
+
+    async def restart():
+        start_http_sessions()
+        session = get_http_session("https://api.openai.com/v1")
+        await close_http_sessions()
+        return session
+
+    first = asyncio.run(start())
+    second = asyncio.run(restart())
+    assert first.closed
+    assert second is not first
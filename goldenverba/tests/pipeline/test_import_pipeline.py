@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from goldenverba.verba_manager import VerbaManager
+
+
+class FakeLogger:
+    def __init__(self, closed: bool = False):
+        self.closed = closed
+        self.reports = []
+
+    async def send_report(self, file_id, status, message, took):
+        if self.closed:
+            raise Exception("WebSocket is closed")
+        self.reports.append((file_id, status))
+
+
+class FakeWeaviateManager:
+    async def exist_document_names(self, client, names):
+        return {}
+
+
+def make_manager(fail: set[str] = set(), block: asyncio.Event | None = None):
+    manager = VerbaManager()
+    manager.weaviate_manager = FakeWeaviateManager()
+    manager.ingested = []
+
+    async def chunk_document(client, job, logger):
+        await asyncio.sleep(0)
+
+    async def embed_document(client, job, logger):
+        if job["documents"][0].title in fail:
+            raise Exception("Embedding failed")
+        await asyncio.sleep(0)
+
+    async def ingest_document(client, job, logger):
+        if block is not None:
+            await block.wait()
+        manager.ingested.append(job["documents"][0].title)
+        job["chunks"] = len(job["documents"][0].chunks)
+
+    manager.batches = []
+    manager.chunker_manager.prepare_documents = lambda chunker, documents: (
+        manager.batches.append(len(documents))
+    )
+    manager.chunk_document = chunk_document
+    manager.embed_document = embed_document
+    manager.ingest_document = ingest_document
+    return manager
+
+
+def make_documents(count: int):
+    return [SimpleNamespace(title=f"doc-{i}", chunks=[i] * i) for i in range(count)]
+
+
+FILE_CONFIG = SimpleNamespace(
+    fileID="file",
+    filename="file",
+    isURL=False,
+    rag_config={"Chunker": SimpleNamespace(selected="Token")},
+)
+
+
+def run_pipeline(manager, documents, logger):
+    async def run():
+        results = await asyncio.wait_for(
+            manager.run_import_pipeline(None, documents, FILE_CONFIG, logger), 5
+        )
+        return results, len(asyncio.all_tasks())
+
+    return asyncio.run(run())
+
+
+def test_pipeline_order_and_failures():
+    """Test that all stages finish, documents keep their order with one worker and failures are reported per document"""
+    manager = make_manager(fail={"doc-2"})
+    manager.import_concurrency = {"chunk": 1, "embed": 1, "ingest": 1}
+    manager.chunk_batch_size = 4
+    logger = FakeLogger()
+
+    results, pending = run_pipeline(manager, make_documents(6), logger)
+
+    assert manager.ingested == ["doc-0", "doc-1", "doc-3", "doc-4", "doc-5"]
+    assert isinstance(results[2], Exception)
+    assert [result for i, result in enumerate(results) if i != 2] == [0, 1, 3, 4, 5]
+    assert [status for _, status in logger.reports] == ["ERROR"]
+    assert manager.batches == [4, 2]
+    assert pending == 1
+
+
+def test_pipeline_closed_websocket():
+    """Test that a failing error report does not stop the import"""
+    manager = make_manager(fail={"doc-0"})
+    results, pending = run_pipeline(manager, make_documents(10), FakeLogger(True))
+
+    assert isinstance(results[0], Exception)
+    assert sorted(manager.ingested) == [f"doc-{i}" for i in range(1, 10)]
+    assert pending == 1
+
+
+def test_pipeline_cancels_stages():
+    """Test that no stage keeps running when a worker dies or the import is cancelled"""
+    manager = make_manager(fail={"doc-0"})
+
+    async def broken_report(job, error, logger):
+        raise RuntimeError("Report failed")
+
+    manager.report_document_error = broken_report
+
+    async def run_broken():
+        with pytest.raises(RuntimeError):
+            await manager.run_import_pipeline(
+                None, make_documents(10), FILE_CONFIG, FakeLogger()
+            )
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(run_broken()) == 1
+
+    block = asyncio.Event()
+    manager = make_manager(block=block)
+
+    async def run_cancelled():
+        task = asyncio.create_task(
+            manager.run_import_pipeline(
+                None, make_documents(10), FILE_CONFIG, FakeLogger()
+            )
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        block.set()
+        await asyncio.sleep(0.05)
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(run_cancelled()) == 1
+    assert manager.ingested == []
+
+
+def test_ingest_releases_chunks():
+    """Test that chunks are dropped once a document is stored and only their count is kept"""
+    manager = VerbaManager()
+    imported = []
+
+    class FakeImporter:
+        async def import_document(self, client, document, embedder):
+            imported.append((document.title, len(document.chunks), embedder))
+
+    manager.weaviate_manager = FakeImporter()
+    embedder = SimpleNamespace(
+        selected="Ollama",
+        components={
+            "Ollama": SimpleNamespace(config={"Model": SimpleNamespace(value="bge")})
+        },
+    )
+    file_config = SimpleNamespace(
+        fileID="file", filename="file", rag_config={"Embedder": embedder}
+    )
+    document = SimpleNamespace(title="doc", chunks=["a", "b", "c"])
+    job = {
+        "fileConfig": file_config,
+        "originalFileConfig": file_config,
+        "documents": [document],
+        "start_time": 0,
+    }
+
+    asyncio.run(manager.ingest_document(None, job, FakeLogger()))
+    assert imported == [("doc", 3, "bge")]
+    assert job["chunks"] == 3
+    assert document.chunks == []
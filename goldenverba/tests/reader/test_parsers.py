@@ -0,0 +1,38 @@
+import sys
+import asyncio
+import subprocess
+
+from goldenverba.components.reader import parsers
+
+
+def test_parse_csv_in_process_pool(monkeypatch):
+    """Test that a parser round-trips its input and result through the reader process pool"""
+    monkeypatch.setenv("VERBA_READER_WORKERS", "1")
+    parsers.shutdown_process_pool()
+
+    async def run():
+        return await parsers.run_in_process_pool(
+            parsers.parse_csv, "title,pages\nVerba,12\n".encode("utf-8")
+        )
+
+    try:
+        text = asyncio.run(run())
+        assert parsers.get_process_pool() is not None
+    finally:
+        parsers.shutdown_process_pool()
+    assert text == parsers.parse_csv(b"title,pages\nVerba,12\n")
+    assert "Row 1: title: Verba | pages: 12" in text
+
+
+def test_parsers_import_without_pandas():
+    """Test that the pool workers don't import pandas until an Excel file is parsed"""
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, goldenverba.components.reader.parsers;"
+            "print('pandas' in sys.modules)",
+        ],
+        text=True,
+    )
+    assert output.strip() == "False"
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+from goldenverba.components.managers import RetrieverManager, WeaviateManager
+
+CONFIGURATION = {"VERBA_CONFIGURATION": {}}
+
+
+def make_rag_config(limit: int) -> dict:
+    def component(selected: str, config: dict) -> SimpleNamespace:
+        return SimpleNamespace(
+            selected=selected,
+            components={
+                selected: SimpleNamespace(
+                    config={
+                        key: SimpleNamespace(value=value)
+                        for key, value in config.items()
+                    }
+                )
+            },
+        )
+
+    return {
+        "Retriever": component("Advanced", {"Chunk Window": 1, "Limit": limit}),
+        "Embedder": component("Ollama", {"Model": "nomic-embed-text"}),
+    }
+
+
+def test_retrieval_cache_key(weaviate_client):
+    """Test that the key normalizes whitespace and filters, and changes with query case, config and corpus version"""
+    weaviate_manager = WeaviateManager()
+    retriever_manager = RetrieverManager()
+    client = weaviate_client(CONFIGURATION)
+
+    async def run():
+        async def key(query, rag_config, labels, document_uuids):
+            return await retriever_manager.get_cache_key(
+                client, query, rag_config, weaviate_manager, labels, document_uuids
+            )
+
+        first = await key("What is  Verba?", make_rag_config(5), ["a", "b"], ["2", "1"])
+        assert first == await key(
+            "What is Verba?", make_rag_config(5), ["b", "a"], ["1", "2"]
+        )
+        assert first != await key(
+            "what is verba?", make_rag_config(5), ["a", "b"], ["1", "2"]
+        )
+        assert first != await key(
+            "What is Verba?", make_rag_config(6), ["a", "b"], ["1", "2"]
+        )
+        assert first != await key(
+            "What is Verba?", make_rag_config(5), ["a"], ["1", "2"]
+        )
+
+        await weaviate_manager.bump_corpus_version(client)
+        assert first != await key(
+            "What is Verba?", make_rag_config(5), ["a", "b"], ["1", "2"]
+        )
+
+        other_client = weaviate_client(CONFIGURATION)
+        assert await weaviate_manager.get_corpus_version(
+            other_client
+        ) != await weaviate_manager.get_corpus_version(client)
+
+    asyncio.run(run())
+
+
+def test_corpus_version_shared_between_processes(weaviate_client):
+    """Test that an import of another process changes the version and invalidates the registry"""
+    client = weaviate_client(CONFIGURATION)
+    worker = WeaviateManager()
+    other_worker = WeaviateManager()
+    worker.corpus_version_ttl = 0
+
+    async def run():
+        version = await worker.get_corpus_version(client)
+        assert await worker.verify_collection(client, "VERBA_CONFIGURATION")
+        assert client in worker.collection_registry
+
+        await other_worker.bump_corpus_version(client)
+        worker.collection_registry[client].add("VERBA_Embedding_dropped")
+        assert await worker.get_corpus_version(client) != version
+        assert "VERBA_Embedding_dropped" not in worker.collection_registry.get(
+            client, set()
+        )
+
+    asyncio.run(run())
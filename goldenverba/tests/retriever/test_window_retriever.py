@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+
+from goldenverba.components.retriever import WindowRetriever as window_retriever
+from goldenverba.components.retriever.WindowRetriever import WindowRetriever
+
+
+def make_chunk(doc_uuid: str, chunk_id: int, score: float = 0):
+    return SimpleNamespace(
+        uuid=f"{doc_uuid}-{chunk_id}",
+        properties={
+            "doc_uuid": doc_uuid,
+            "chunk_id": chunk_id,
+            "content": f"{doc_uuid} chunk {chunk_id}",
+        },
+        metadata=SimpleNamespace(score=score),
+    )
+
+
+class FakeWeaviateManager:
+    def __init__(self, hits: list):
+        self.hits = hits
+        self.window_requests = []
+        self.searches = []
+
+    async def hybrid_chunks(self, *args, alpha: float = 0.5):
+        self.searches.append(("hybrid", alpha))
+        return self.hits
+
+    async def keyword_chunks(self, *args):
+        self.searches.append(("keyword", None))
+        return self.hits
+
+    async def get_documents_by_ids(self, client, uuids, properties):
+        return {str(uuid): {"title": str(uuid), "metadata": ""} for uuid in uuids}
+
+    async def get_chunks_by_document_ids(self, client, embedder, ids_by_document):
+        self.window_requests.append(ids_by_document)
+        return {
+            doc_uuid: [make_chunk(doc_uuid, i) for i in ids if i >= 0]
+            for doc_uuid, ids in ids_by_document.items()
+        }
+
+
+def test_window_expansion_single_query():
+    """Test that windows of all documents are fetched together and hits are not fetched again"""
+    retriever = WindowRetriever()
+    retriever.config["Threshold"].value = 0
+    hits = [
+        make_chunk("doc-a", 4, 0.9),
+        make_chunk("doc-a", 5, 0.8),
+        make_chunk("doc-b", 1, 0.5),
+    ]
+    weaviate_manager = FakeWeaviateManager(hits)
+
+    documents, context = asyncio.run(
+        retriever.retrieve(
+            None, "query", [0.1], retriever.config, weaviate_manager, "model", [], []
+        )
+    )
+
+    assert len(weaviate_manager.window_requests) == 1
+    assert weaviate_manager.window_requests[0] == {"doc-a": [3, 6], "doc-b": [0, 2]}
+    assert [chunk["chunk_id"] for chunk in documents[0]["chunks"]] == [3, 4, 5, 6]
+    assert "doc-b chunk 2" in context
+
+
+def test_search_modes():
+    """Test that BM25 needs no query vector and the modes select the matching search"""
+    retriever = WindowRetriever()
+    weaviate_manager = FakeWeaviateManager([make_chunk("doc-a", 0, 0.9)])
+
+    for mode, alpha in [("Keyword (BM25)", 20), ("Vector", 20), ("Hybrid Search", 20)]:
+        retriever.config["Search Mode"].value = mode
+        retriever.config["Alpha"].value = alpha
+        asyncio.run(
+            retriever.retrieve(
+                None, "E404", None, retriever.config, weaviate_manager, "model", [], []
+            )
+        )
+
+    retriever.config["Search Mode"].value = "Keyword (BM25)"
+    assert not retriever.requires_vector(retriever.config)
+    assert weaviate_manager.searches == [
+        ("keyword", None),
+        ("hybrid", 1.0),
+        ("hybrid", 0.2),
+    ]
+
+
+def test_combine_context_budget(monkeypatch):
+    """Test that the best chunks are packed within the budget without duplicate or overlapping text"""
+    monkeypatch.setattr(
+        window_retriever, "count_tokens", lambda text: len(text.split())
+    )
+    monkeypatch.setattr(window_retriever, "CHUNK_HEADER_TOKENS", 0)
+
+    def chunk(chunk_id, score, content):
+        return {"chunk_id": chunk_id, "score": score, "content": content}
+
+    documents = [
+        {
+            "title": "A",
+            "metadata": "",
+            "score": 1.5,
+            "chunks": [
+                chunk(0, 0.9, "alpha beta gamma delta"),
+                chunk(1, 0, "gamma delta epsilon zeta"),
+                chunk(2, 0, "alpha beta gamma delta"),
+            ],
+        },
+        {
+            "title": "B",
+            "metadata": "",
+            "score": 0.6,
+            "chunks": [chunk(0, 0.6, "one two three four five six seven eight")],
+        },
+    ]
+    retriever = WindowRetriever()
+
+    context = retriever.combine_context(documents, max_tokens=12)
+    assert "alpha beta gamma delta\nChunk: 2\nepsilon zeta\n" in context
+    assert "Chunk: 3" not in context
+    assert "Document Title: B" not in context
+
+    unlimited = retriever.combine_context(documents)
+    assert "Document Title: B" in unlimited
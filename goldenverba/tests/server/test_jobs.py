@@ -0,0 +1,64 @@
+import asyncio
+
+from goldenverba.server.helpers import JobManager
+
+
+def test_job_progress():
+    """Test that jobs report progress and their final status"""
+    job_manager = JobManager()
+
+    async def run():
+        async def work(progress):
+            for i in range(3):
+                await progress(i + 1, 3)
+
+        async def fail(progress):
+            raise Exception("Collection not found")
+
+        job_id = job_manager.start_job("Reset DOCUMENTS", work)
+        assert job_manager.get_job(job_id)["status"] == "RUNNING"
+        job = await job_manager.wait_for_job(job_id)
+        assert job["status"] == "DONE"
+        assert (job["completed"], job["total"]) == (3, 3)
+
+        job = await job_manager.wait_for_job(job_manager.start_job("Reset ALL", fail))
+        assert job["status"] == "ERROR"
+        assert job["error"] == "Collection not found"
+
+    asyncio.run(run())
+
+
+def test_job_survives_cancelled_wait():
+    """Test that cancelling a request waiting on a job doesn't cancel the job"""
+    job_manager = JobManager()
+
+    async def run():
+        async def work(progress):
+            await asyncio.sleep(0.05)
+            await progress(1, 1)
+
+        job_id = job_manager.start_job("Reset ALL", work)
+        waiter = asyncio.create_task(job_manager.wait_for_job(job_id))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.1)
+        assert job_manager.get_job(job_id)["status"] == "DONE"
+
+    asyncio.run(run())
+
+
+def test_job_owner():
+    """Test that jobs are only visible to the cluster they were started for"""
+    job_manager = JobManager()
+
+    async def run():
+        async def work(progress):
+            pass
+
+        job_id = job_manager.start_job("Reset ALL", work, owner="http://weaviate-a")
+        await job_manager.wait_for_job(job_id)
+        assert job_manager.get_job(job_id, owner="http://weaviate-a") is not None
+        assert job_manager.get_job(job_id, owner="http://weaviate-b") is None
+        assert job_manager.get_job(job_id) is None
+
+    asyncio.run(run())
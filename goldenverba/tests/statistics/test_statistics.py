@@ -0,0 +1,95 @@
+import asyncio
+
+from goldenverba.components.managers import WeaviateManager
+from goldenverba.components.statistics import CorpusStatistics
+
+
+def test_corpus_statistics():
+    """Test that counts follow imports and deletes"""
+    statistics = CorpusStatistics()
+    statistics.add_document("doc-1", ["Docs", "Verba"], "text-embedding-3-small", 10)
+    statistics.add_document("doc-2", ["Docs"], "nomic-embed-text", 4)
+
+    assert statistics.get_labels() == ["Docs", "Verba"]
+    assert statistics.get_label_counts() == {"Docs": 2, "Verba": 1}
+    assert statistics.get_document_count() == 2
+    assert statistics.get_document_count(labels=["Docs", "Verba"]) == 1
+    assert statistics.get_document_count(embedder="nomic-embed-text") == 1
+    assert (
+        statistics.get_document_count(
+            embedder="text-embedding-3-small", document_uuids=["doc-2"]
+        )
+        == 0
+    )
+    assert statistics.get_chunk_count("doc-1") == 10
+    assert statistics.total_chunks == 14
+
+    statistics.remove_document("doc-1")
+    assert statistics.get_labels() == ["Docs"]
+    assert statistics.get_chunk_count("doc-1") is None
+    assert statistics.total_chunks == 4
+
+
+def documents(*uuids: str) -> dict:
+    return {
+        uuid: {
+            "title": uuid,
+            "title_key": uuid,
+            "labels": ["Docs"],
+            "embedder": "nomic-embed-text",
+        }
+        for uuid in uuids
+    }
+
+
+def test_statistics_follow_other_processes(weaviate_client):
+    """Test that an import of another process drops the statistics of this one"""
+    client = weaviate_client({"VERBA_DOCUMENTS": {}, "VERBA_CONFIGURATION": {}})
+    worker = WeaviateManager()
+    other_worker = WeaviateManager()
+    worker.corpus_version_ttl = 0
+
+    async def run():
+        assert await worker.get_documents(client, "", 10, 1, []) == ([], 0)
+        client.collections.get("VERBA_DOCUMENTS").objects.update(documents("doc-1"))
+        await other_worker.bump_corpus_version(client)
+        titles, count = await worker.get_documents(client, "", 10, 1, [])
+        assert [document["title"] for document in titles] == ["doc-1"]
+        assert count == 1
+
+    asyncio.run(run())
+
+
+def test_concurrent_first_requests_share_one_scan(weaviate_client):
+    """Test that the documents are scanned once for concurrent first requests"""
+    client = weaviate_client({"VERBA_DOCUMENTS": documents("doc-1", "doc-2")})
+    manager = WeaviateManager()
+    collection = client.collections.get("VERBA_DOCUMENTS")
+
+    async def run():
+        results = await asyncio.gather(
+            *[manager.get_statistics(client) for _ in range(5)]
+        )
+        assert [statistics.get_document_count() for statistics in results] == [2] * 5
+        assert collection.calls == 1
+
+    asyncio.run(run())
+
+
+def test_reconcile_keeps_concurrent_imports(weaviate_client):
+    """Test that documents imported during a reconcile are counted in its result"""
+    client = weaviate_client({"VERBA_DOCUMENTS": documents("doc-1", "doc-2")})
+    manager = WeaviateManager()
+
+    async def run():
+        task = asyncio.create_task(manager.get_statistics(client))
+        while client not in manager.statistics_changes:
+            await asyncio.sleep(0)
+        manager.record_document_added(client, "doc-3", ["New"], "bge-m3", 4)
+        manager.record_document_removed(client, "doc-1")
+        statistics = await task
+        assert sorted(statistics.documents) == ["doc-2", "doc-3"]
+        assert statistics.get_label_counts() == {"Docs": 1, "New": 1}
+        assert manager.statistics[client] is statistics
+
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+import asyncio
+
+from goldenverba.components.managers import WeaviateManager
+
+
+def test_collection_registry(weaviate_client):
+    """Test that collections are looked up once per client and created lazily"""
+    manager = WeaviateManager()
+    client = weaviate_client({"VERBA_DOCUMENTS": {}})
+
+    async def run():
+        for _ in range(3):
+            assert await manager.verify_collection(client, "VERBA_DOCUMENTS")
+        assert client.collections.calls == 1
+
+        assert await manager.verify_embedding_collection(client, "all-MiniLM-L6-v2")
+        assert "VERBA_Embedding_all_MiniLM_L6_v2" in client.collections.names
+        calls = client.collections.calls
+        assert await manager.verify_embedding_collection(client, "all-MiniLM-L6-v2")
+        assert client.collections.calls == calls
+
+        manager.invalidate_collections(client)
+        assert await manager.verify_collection(client, "VERBA_DOCUMENTS")
+        assert client.collections.calls == calls + 1
+
+    asyncio.run(run())
+
+
+def test_delete_all_documents_drops_collections(weaviate_client):
+    """Test that deleting all documents drops the document and embedding collections only"""
+    manager = WeaviateManager()
+    client = weaviate_client(
+        {
+            "VERBA_DOCUMENTS": {},
+            "VERBA_Embedding_text_embedding_3_small": {},
+            "VERBA_Cache_text_embedding_3_small": {},
+            "VERBA_CONFIGURATION": {},
+        }
+    )
+    reports = []
+
+    async def progress(completed: int, total: int):
+        reports.append((completed, total))
+
+    asyncio.run(manager.delete_all_documents(client, progress))
+    assert client.collections.names == {
+        "VERBA_Cache_text_embedding_3_small",
+        "VERBA_CONFIGURATION",
+    }
+    assert reports == [(1, 2), (2, 2)]
@@ -0,0 +1,121 @@
+import json
+import asyncio
+
+from goldenverba.components.managers import WeaviateManager, get_embedder_from_meta
+
+# Collections created after the embedder and title key became properties, nothing to migrate
+SCHEMA = {"VERBA_DOCUMENTS": ["title", "meta", "embedder", "title_key"]}
+
+
+def test_get_documents_by_ids_is_cached(weaviate_client):
+    """Test that documents are fetched in one request and served from the cache afterwards"""
+    uuid = "b4c5e2c9-1d1e-4a3b-8e8b-2f2a4c7a3f10"
+    documents = {uuid: {"title": "Verba", "metadata": "", "meta": "{}"}}
+    manager = WeaviateManager()
+    client = weaviate_client({"VERBA_DOCUMENTS": documents}, SCHEMA)
+    query = client.collections.get("VERBA_DOCUMENTS")
+
+    async def run():
+        documents = await manager.get_documents_by_ids(client, [uuid, uuid])
+        assert documents == {uuid: {"title": "Verba", "metadata": ""}}
+        assert query.calls == 1
+
+        documents = await manager.get_documents_by_ids(client, [uuid], ["title"])
+        assert documents == {uuid: {"title": "Verba"}}
+        assert query.calls == 1
+
+        manager.document_cache.invalidate(uuid)
+        await manager.get_documents_by_ids(client, [uuid], ["title"])
+        assert query.calls == 2
+
+    asyncio.run(run())
+
+
+def test_exist_document_names(weaviate_client):
+    """Test that a batch of titles is resolved with one query and only exact titles count as duplicates"""
+    titles = {f"uuid-{i}": f"Annual Report {i}.pdf" for i in range(100)}
+    titles.update(
+        {
+            f"uuid-case-{i}": "ReadMe.md".swapcase()[:i] + "ReadMe.md"[i:]
+            for i in range(9)
+        }
+    )
+    titles["uuid-report"] = "Report.pdf"
+    titles["uuid-readme"] = "README.md"
+    titles["uuid-docs-readme"] = "docs README.md"
+    documents = {
+        uuid: {"title": title, "title_key": title} for uuid, title in titles.items()
+    }
+    manager = WeaviateManager()
+    client = weaviate_client({"VERBA_DOCUMENTS": documents}, SCHEMA)
+    query = client.collections.get("VERBA_DOCUMENTS")
+
+    async def run():
+        duplicates = await manager.exist_document_names(
+            client, ["Report.pdf", "README.md", "setup.py", "Report.pdf"]
+        )
+        assert duplicates == {"Report.pdf": "uuid-report", "README.md": "uuid-readme"}
+        assert query.calls == 1
+        assert await manager.exist_document_name(client, "setup.py") is None
+
+    asyncio.run(run())
+
+
+def test_get_document_embedder(weaviate_client):
+    """Test that the stored embedder is used and cached without parsing the meta config"""
+    uuid = "b4c5e2c9-1d1e-4a3b-8e8b-2f2a4c7a3f10"
+    documents = {uuid: {"title": "Verba", "embedder": "text-embedding-3-small"}}
+    manager = WeaviateManager()
+    client = weaviate_client({"VERBA_DOCUMENTS": documents}, SCHEMA)
+    query = client.collections.get("VERBA_DOCUMENTS")
+
+    async def run():
+        for _ in range(2):
+            embedder = await manager.get_document_embedder(client, uuid)
+            assert embedder == "text-embedding-3-small"
+        assert query.calls == 1
+
+    asyncio.run(run())
+
+
+def test_document_property_backfill(weaviate_client):
+    """Test that adding the embedder and title key properties migrates existing documents in the background"""
+    meta = json.dumps({"Embedder": {"config": {"Model": {"value": "nomic-embed"}}}})
+    documents = {
+        "uuid-old": {"title": "Old", "meta": meta},
+        "uuid-new": {"title": "New", "meta": meta, "embedder": "bge-m3"},
+    }
+    manager = WeaviateManager()
+    client = weaviate_client(
+        {"VERBA_DOCUMENTS": documents}, {"VERBA_DOCUMENTS": ["title", "meta"]}
+    )
+    collection = client.collections.get("VERBA_DOCUMENTS")
+
+    async def run():
+        assert await manager.verify_document_collection(client)
+        assert [prop.name for prop in collection.config.properties] == [
+            "title",
+            "meta",
+            "embedder",
+            "title_key",
+        ]
+        await manager.backfill_tasks[client]
+        assert collection.objects["uuid-old"]["embedder"] == "nomic-embed"
+        assert collection.objects["uuid-new"]["embedder"] == "bge-m3"
+        assert collection.values("title_key") == ["Old", "New"]
+        assert await manager.exist_document_names(client, ["Old"]) == {
+            "Old": "uuid-old"
+        }
+
+        # The properties are only added once, nothing to migrate afterwards
+        manager.invalidate_collections(client)
+        await manager.verify_document_collection(client)
+        assert manager.backfill_tasks[client].done()
+
+    asyncio.run(run())
+
+
+def test_get_embedder_from_meta():
+    """Test reading the embedder of documents imported before it was stored"""
+    meta = json.dumps({"Embedder": {"config": {"Model": {"value": "nomic-embed"}}}})
+    assert get_embedder_from_meta(meta) == "nomic-embed"
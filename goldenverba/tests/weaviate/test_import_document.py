@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from goldenverba.components.chunk import Chunk
+from goldenverba.components.document import Document
+from goldenverba.components.managers import WeaviateManager
+
+CHUNKS = "VERBA_Embedding_bge"
+
+
+def make_manager() -> WeaviateManager:
+    manager = WeaviateManager()
+    manager.insert_batch_size = 4
+
+    async def project_chunks(client, embedder, chunks):
+        pass
+
+    manager.project_chunks = project_chunks
+    return manager
+
+
+def make_document(chunks: int) -> Document:
+    document = Document(title="Verba.md", labels=["Docs"])
+    document.chunks = [Chunk(content=f"chunk-{i}", chunk_id=i) for i in range(chunks)]
+    for chunk in document.chunks:
+        chunk.vector = [0.1, 0.2]
+    return document
+
+
+def test_import_document_in_batches(weaviate_client):
+    """Test that chunks are inserted in fixed-size batches and counted in the statistics"""
+    manager = make_manager()
+    client = weaviate_client()
+
+    async def run():
+        await manager.get_statistics(client)
+        await manager.import_document(client, make_document(10), "bge")
+
+    asyncio.run(run())
+    chunks = client.collections.get(CHUNKS)
+    assert [len(batch) for batch in chunks.inserts] == [4, 4, 2]
+    assert sorted(chunks.values("content")) == sorted(f"chunk-{i}" for i in range(10))
+    (doc_uuid,) = client.collections.get("VERBA_DOCUMENTS").objects
+    assert set(chunks.values("doc_uuid")) == {doc_uuid}
+    assert set(chunks.values("title")) == {"Verba.md"}
+    assert manager.statistics[client].get_chunk_count(doc_uuid) == 10
+
+
+def test_import_document_rolls_back_failed_batches(weaviate_client):
+    """Test that a rejected chunk reports its index and removes every chunk of the document"""
+    manager = make_manager()
+    client = weaviate_client()
+
+    async def run():
+        await manager.verify_embedding_collection(client, "bge")
+        chunks = client.collections.get(CHUNKS)
+        chunks.rejected = {"chunk-9"}
+        # More chunks than one delete_many removes
+        chunks.max_results = 3
+        with pytest.raises(Exception, match=r"1 of 2 chunks.*\{9: 'rejected'\}"):
+            await manager.import_document(client, make_document(10), "bge")
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert len(chunks.inserts) == 3
+    assert chunks.objects == {}
+    assert client.collections.get("VERBA_DOCUMENTS").objects == {}
+
+
+def test_delete_document_removes_all_chunks(weaviate_client):
+    """Test that deleting a document repeats delete_many until no chunk is left"""
+    manager = make_manager()
+    client = weaviate_client()
+
+    async def run():
+        await manager.import_document(client, make_document(10), "bge")
+        chunks = client.collections.get(CHUNKS)
+        chunks.max_results = 3
+        (doc_uuid,) = client.collections.get("VERBA_DOCUMENTS").objects
+        await manager.delete_document(client, doc_uuid)
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert chunks.objects == {}
+    assert client.collections.get("VERBA_DOCUMENTS").objects == {}
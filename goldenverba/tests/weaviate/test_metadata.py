@@ -0,0 +1,45 @@
+import asyncio
+
+from goldenverba.components.managers import WeaviateManager
+
+
+def test_get_metadata_concurrent_and_partial(weaviate_client):
+    """Test that collections are counted concurrently and slow ones are reported without count"""
+    manager = WeaviateManager()
+    manager.metadata_concurrency = 3
+    manager.metadata_timeout = 0.1
+    client = weaviate_client(
+        {
+            **{
+                f"VERBA_Embedding_{i}": {f"uuid-{j}": {} for j in range(i)}
+                for i in range(6)
+            },
+            "Slow": {},
+        }
+    )
+    client.collections.get("Slow").delay = 1
+
+    node_payload, collection_payload = asyncio.run(manager.get_metadata(client))
+    assert node_payload["node_count"] == 1
+    assert client.collections.peak == 3
+    assert collection_payload["partial"]
+    assert collection_payload["collections"][0] == {
+        "name": "VERBA_Embedding_5",
+        "count": 5,
+    }
+    assert collection_payload["collections"][-1] == {"name": "Slow", "count": None}
+
+
+def test_get_metadata_is_cached(weaviate_client):
+    """Test that complete results are served from the cache"""
+    manager = WeaviateManager()
+    client = weaviate_client({"VERBA_DOCUMENTS": {"uuid-0": {}, "uuid-1": {}}})
+
+    async def run():
+        first = await manager.get_metadata(client)
+        client.collections.get("VERBA_DOCUMENTS").objects["uuid-2"] = {}
+        return first, await manager.get_metadata(client)
+
+    first, second = asyncio.run(run())
+    assert second == first
+    assert second[1]["collections"][0]["count"] == 2
@@ -0,0 +1,219 @@
+import asyncio
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+from weaviate.util import generate_uuid5
+
+from goldenverba.components.managers import WeaviateManager
+from goldenverba.components.suggestions import SuggestionIndex, normalize_timestamp
+
+
+def stored(*queries: str) -> dict:
+    return {
+        "VERBA_SUGGESTIONS": {
+            generate_uuid5(query): {"query": query, "timestamp": f"2024-01-0{i + 1}"}
+            for i, query in enumerate(queries)
+        }
+    }
+
+
+def test_suggestions_write_behind(weaviate_client):
+    """Test that suggestions are queued without Weaviate calls and flushed as one deduplicated batch"""
+    manager = WeaviateManager()
+    manager.suggestion_flush_interval = 0.05
+    client = weaviate_client(stored("What is Verba?"))
+    collection = client.collections.get("VERBA_SUGGESTIONS")
+
+    async def run():
+        for query in ["What is Verba?", "How to import?", "How to import?"]:
+            manager.add_suggestion(client, query)
+        assert collection.inserts == []
+
+        await asyncio.sleep(0.1)
+        assert len(collection.inserts) == 1
+        assert [s.properties["query"] for s in collection.inserts[0]] == [
+            "How to import?"
+        ]
+
+        manager.add_suggestion(client, "What are labels?")
+        await manager.disconnect(client)
+        assert [s.properties["query"] for s in collection.inserts[1]] == [
+            "What are labels?"
+        ]
+
+    asyncio.run(run())
+
+
+def test_reset_drops_queued_suggestions(weaviate_client):
+    """Test that queued suggestions aren't written back after the suggestions were deleted"""
+    manager = WeaviateManager()
+    manager.suggestion_flush_interval = 0.05
+    client = weaviate_client(stored("What is Verba?"))
+    collection = client.collections.get("VERBA_SUGGESTIONS")
+
+    async def run():
+        manager.add_suggestion(client, "How to import?")
+        await manager.delete_all(client)
+        await asyncio.sleep(0.1)
+        assert client not in manager.pending_suggestions
+        assert await manager.retrieve_suggestions(client, "how", 5) == []
+        assert collection.inserts == []
+        assert client.collections.get("VERBA_SUGGESTIONS").inserts == []
+
+    asyncio.run(run())
+
+
+def test_failed_suggestions_are_retried(weaviate_client):
+    """Test that rejected objects and failed writes are queued again, up to the retry limit"""
+    manager = WeaviateManager()
+    manager.suggestion_flush_interval = 0.01
+    client = weaviate_client(stored("What is Verba?"))
+    collection = client.collections.get("VERBA_SUGGESTIONS")
+
+    async def run():
+        collection.fail = 1
+        collection.rejected = {"Bad query"}
+        manager.add_suggestion(client, "What is")
+        manager.add_suggestion(client, "Bad query")
+        await asyncio.sleep(0.2)
+
+        # "What is" is only a token match of a stored query, so it's inserted
+        assert "What is" in collection.values("query")
+        assert "Bad query" not in collection.values("query")
+        inserted = [
+            s.properties["query"] for batch in collection.inserts for s in batch
+        ]
+        # The first attempt raised before inserting
+        assert inserted.count("Bad query") == manager.suggestion_max_retries
+        assert client not in manager.pending_suggestions
+        assert manager.suggestion_retries[client] == {}
+
+    asyncio.run(run())
+
+
+def test_disconnect_cancels_delayed_flush(weaviate_client):
+    """Test that a delayed flush which is still sleeping doesn't retry failures on the closed client"""
+    manager = WeaviateManager()
+    manager.suggestion_flush_interval = 0.05
+    client = weaviate_client(stored("What is Verba?"))
+    collection = client.collections.get("VERBA_SUGGESTIONS")
+
+    async def run():
+        collection.rejected = {"Bad query"}
+        manager.add_suggestion(client, "Bad query")
+        task = manager.suggestion_tasks[client]
+        assert await manager.disconnect(client)
+
+        await asyncio.sleep(0.1)
+        assert task.cancelled()
+        assert client not in manager.suggestion_tasks
+        assert client not in manager.pending_suggestions
+        assert len(collection.inserts) == 1
+
+    asyncio.run(run())
+
+
+def test_stored_suggestions_are_found_by_id(weaviate_client):
+    """Test that stored queries are looked up by their uuid in one request and a concurrent insert counts as saved"""
+    manager = WeaviateManager()
+    client = weaviate_client(stored("What is Verba?", "What are labels?"))
+    collection = client.collections.get("VERBA_SUGGESTIONS")
+
+    async def run():
+        failed = await manager.add_suggestions(
+            client, {"What is Verba?": "2024-02-01", "How to import?": "2024-02-01"}
+        )
+        assert failed == {}
+        assert collection.calls == 1
+        assert [s.properties["query"] for s in collection.inserts[0]] == [
+            "How to import?"
+        ]
+
+        # Another worker stored the query between the lookup and the insert
+        async def lookup(**kwargs):
+            return SimpleNamespace(objects=[])
+
+        collection.fetch_objects = lookup
+        failed = await manager.add_suggestions(
+            client, {"What are labels?": "2024-02-02"}
+        )
+        assert failed == {}
+        assert collection.values("query").count("What are labels?") == 1
+
+    asyncio.run(run())
+
+
+def test_suggestion_index_ranking():
+    """Test that completions match the prefix and rank by frequency, then recency"""
+    index = SuggestionIndex()
+    index.add("How to import?", "2024-01-01", "a")
+    index.add("How to chunk?", "2024-01-02", "b")
+    index.add("how to import?", "2024-01-03", "c")
+    index.add("What is Verba?", "2024-01-04", "d")
+
+    suggestions = index.search("HOW to", 5)
+    assert [s["query"] for s in suggestions] == ["how to import?", "How to chunk?"]
+    assert suggestions[0]["timestamp"] == "2024-01-03T00:00:00+00:00"
+    assert index.search("how to", 1)[0]["uuid"] == "c"
+
+    assert index.remove("a") == "How to import?"
+    assert index.remove("c") == "how to import?"
+    assert [s["query"] for s in index.search("how", 5)] == ["How to chunk?"]
+    assert index.search("x", 5) == []
+
+
+def test_suggestion_index_case_variants():
+    """Test that spellings differing in case keep their own uuid, so deleting one leaves no ghost entry"""
+    index = SuggestionIndex()
+    index.add("Foo", "2024-01-01T00:00:00Z", "a")
+    index.add("foo", "2024-01-02T00:00:00+00:00", "b")
+    index.add("Foo", datetime(2024, 1, 3, tzinfo=timezone.utc), "c")
+
+    assert len(index) == 2
+    suggestions = index.search("f", 5)
+    assert suggestions == [
+        {"query": "Foo", "timestamp": "2024-01-03T00:00:00+00:00", "uuid": "a"}
+    ]
+
+    assert index.remove("b") == "foo"
+    assert index.search("foo", 5)[0]["uuid"] == "a"
+    assert index.remove("a") == "Foo"
+    assert index.search("foo", 5) == []
+    assert index.keys == []
+
+
+def test_suggestion_index_normalizes_timestamps():
+    """Test that naive and offset timestamps are compared in UTC"""
+    index = SuggestionIndex()
+    index.add("Foo", "2024-01-01T12:00:00+02:00", "a")
+    index.add("foo", datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc), "b")
+
+    assert index.search("foo", 1)[0]["query"] == "foo"
+    assert normalize_timestamp("2024-01-01T12:00:00+02:00") == (
+        "2024-01-01T10:00:00+00:00"
+    )
+    naive = datetime(2024, 1, 1, 12, 0)
+    assert normalize_timestamp(naive.isoformat()) == (
+        naive.astimezone(timezone.utc).isoformat()
+    )
+    assert normalize_timestamp("not a date") == "not a date"
+
+
+def test_retrieve_suggestions_from_index(weaviate_client):
+    """Test that autocomplete is served from the index, loaded once and kept up to date"""
+    manager = WeaviateManager()
+    client = weaviate_client(stored("What is Verba?", "What are labels?"))
+
+    async def run():
+        suggestions = await manager.retrieve_suggestions(client, "what is", 5)
+        assert [s["query"] for s in suggestions] == ["What is Verba?"]
+
+        manager.add_suggestion(client, "What is a chunk?")
+        suggestions = await manager.retrieve_suggestions(client, "what ", 5)
+        assert len(suggestions) == 3
+
+        await manager.delete_suggestions(client, generate_uuid5("What are labels?"))
+        suggestions = await manager.retrieve_suggestions(client, "what a", 5)
+        assert suggestions == []
+
+    asyncio.run(run())
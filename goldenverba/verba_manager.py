@@ -1,7 +1,6 @@
 import os
 import importlib
 import math
-import json
 from datetime import datetime
 
 from dotenv import load_dotenv
@@ -34,6 +33,27 @@ from goldenverba.components.managers import (
 load_dotenv()
 
 
+def release_chunks(job: dict) -> int:
+    """Drop the chunks of the documents of an import job, returns how many there were"""
+    count = 0
+    for document in job["documents"]:
+        count += len(document.chunks)
+        document.chunks = []
+    return count
+
+
+async def gather_or_cancel(*coroutines):
+    """Run coroutines concurrently, if one of them fails or the caller is cancelled the others are cancelled too"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 class VerbaManager:
     """Manages all Verba Components."""
 
@@ -49,6 +69,14 @@ class VerbaManager:
         self.user_config_uuid = "f53f7738-08be-4d5a-b003-13eb4bf03ac7"
         self.environment_variables = {}
         self.installed_libraries = {}
+        self.import_queue_size = max(1, int(os.getenv("VERBA_IMPORT_QUEUE_SIZE", 4)))
+        self.chunk_batch_size = max(1, int(os.getenv("VERBA_CHUNK_BATCH_SIZE", 16)))
+        # Every stage needs at least one worker, otherwise the import never finishes
+        self.import_concurrency = {
+            "chunk": max(1, int(os.getenv("VERBA_CHUNK_CONCURRENCY", 2))),
+            "embed": max(1, int(os.getenv("VERBA_EMBED_CONCURRENCY", 2))),
+            "ingest": max(1, int(os.getenv("VERBA_INGEST_CONCURRENCY", 2))),
+        }
 
         self.verify_installed_libraries()
         self.verify_variables()
@@ -66,6 +94,14 @@ class VerbaManager:
                 client, self.weaviate_manager.config_collection_name
             )
             if initialized:
+                try:
+                    await self.weaviate_manager.verify_document_collection(client)
+                except Exception as e:
+                    msg.warn(f"Failed to verify the document collection: {e}")
+                try:
+                    await self.weaviate_manager.get_suggestion_index(client)
+                except Exception as e:
+                    msg.warn(f"Failed to load suggestions: {e}")
                 end_time = asyncio.get_event_loop().time()
                 msg.info(f"Connection time: {end_time - start_time:.2f} seconds")
                 return client
@@ -126,12 +162,9 @@ class VerbaManager:
                 fileConfig.rag_config["Reader"].selected, fileConfig, logger
             )
 
-            tasks = [
-                self.process_single_document(client, doc, fileConfig, logger)
-                for doc in documents
-            ]
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await self.run_import_pipeline(
+                client, documents, fileConfig, logger
+            )
             successful_tasks = sum(
                 1 for result in results if not isinstance(result, Exception)
             )
@@ -144,10 +177,13 @@ class VerbaManager:
                     took=round(loop.time() - start_time, 2),
                 )
             elif successful_tasks == 1:
+                chunks = next(
+                    result for result in results if not isinstance(result, Exception)
+                )
                 await logger.send_report(
                     fileConfig.fileID,
                     status=FileStatus.INGESTING,
-                    message=f"Imported {fileConfig.filename} and {len(documents[0].chunks)} chunks into Weaviate",
+                    message=f"Imported {fileConfig.filename} and {chunks} chunks into Weaviate",
                     took=round(loop.time() - start_time, 2),
                 )
             elif (
@@ -180,15 +216,88 @@ class VerbaManager:
             )
             return
 
-    async def process_single_document(
+    async def run_import_pipeline(
         self,
         client,
-        document: Document,
+        documents: list[Document],
         fileConfig: FileConfig,
         logger: LoggerManager,
-    ):
+    ) -> list:
+        """Run documents through the chunk, embed and ingest stages.
+        Stages are connected by bounded queues and each stage runs its own pool of workers,
+        so embedding one document overlaps with ingesting the previous one.
+        @returns list - One entry per document, either its number of imported chunks or the Exception that stopped it
+        """
+        results: list = [None] * len(documents)
+        stages = [
+            (self.chunk_document, self.import_concurrency["chunk"]),
+            (self.embed_document, self.import_concurrency["embed"]),
+            (self.ingest_document, self.import_concurrency["ingest"]),
+        ]
+        queues = [
+            asyncio.Queue(maxsize=self.import_queue_size) for _ in range(len(stages))
+        ]
+
+        duplicates = await self.weaviate_manager.exist_document_names(
+            client, [document.title for document in documents]
+        )
+
+        async def read_stage():
+            try:
+                for start in range(0, len(documents), self.chunk_batch_size):
+                    batch = documents[start : start + self.chunk_batch_size]
+                    # One nlp.pipe pass for the whole batch instead of one per document
+                    self.chunker_manager.prepare_documents(
+                        fileConfig.rag_config["Chunker"].selected, batch
+                    )
+                    for index, document in enumerate(batch, start):
+                        job = await self.prepare_document(document, fileConfig, logger)
+                        job["index"] = index
+                        job["duplicate_uuid"] = duplicates.get(document.title)
+                        await queues[0].put(job)
+            finally:
+                for _ in range(stages[0][1]):
+                    await queues[0].put(None)
+
+        async def run_stage(stage_index: int):
+            process, concurrency = stages[stage_index]
+            in_queue = queues[stage_index]
+            out_queue = (
+                queues[stage_index + 1] if stage_index + 1 < len(queues) else None
+            )
+
+            async def worker():
+                while True:
+                    job = await in_queue.get()
+                    if job is None:
+                        break
+                    try:
+                        await process(client, job, logger)
+                    except Exception as e:
+                        results[job["index"]] = e
+                        release_chunks(job)
+                        await self.report_document_error(job, e, logger)
+                        continue
+                    if out_queue is not None:
+                        await out_queue.put(job)
+                    else:
+                        results[job["index"]] = job["chunks"]
+
+            await gather_or_cancel(*[worker() for _ in range(concurrency)])
+            if out_queue is not None:
+                for _ in range(stages[stage_index + 1][1]):
+                    await out_queue.put(None)
+
+        await gather_or_cancel(
+            read_stage(), *[run_stage(i) for i in range(len(stages))]
+        )
+        return results
+
+    async def prepare_document(
+        self, document: Document, fileConfig: FileConfig, logger: LoggerManager
+    ) -> dict:
+        """Create the import job of a single document"""
         loop = asyncio.get_running_loop()
-        start_time = loop.time()
 
         if fileConfig.isURL:
             currentFileConfig = deepcopy(fileConfig)
@@ -203,72 +312,90 @@ class VerbaManager:
         else:
             currentFileConfig = fileConfig
 
-        try:
-            duplicate_uuid = await self.weaviate_manager.exist_document_name(
-                client, document.title
-            )
-            if duplicate_uuid is not None and not currentFileConfig.overwrite:
-                raise Exception(f"{document.title} already exists in Verba")
-            elif duplicate_uuid is not None and currentFileConfig.overwrite:
-                await self.weaviate_manager.delete_document(client, duplicate_uuid)
+        return {
+            "fileConfig": currentFileConfig,
+            "originalFileConfig": fileConfig,
+            "documents": [document],
+            "start_time": loop.time(),
+        }
 
-            chunk_task = asyncio.create_task(
-                self.chunker_manager.chunk(
-                    currentFileConfig.rag_config["Chunker"].selected,
-                    currentFileConfig,
-                    [document],
-                    self.embedder_manager.embedders[
-                        currentFileConfig.rag_config["Embedder"].selected
-                    ],
-                    logger,
-                )
-            )
-            chunked_documents = await chunk_task
-
-            embedding_task = asyncio.create_task(
-                self.embedder_manager.vectorize(
-                    currentFileConfig.rag_config["Embedder"].selected,
-                    currentFileConfig,
-                    chunked_documents,
-                    logger,
-                )
-            )
-            vectorized_documents = await embedding_task
-
-            for document in vectorized_documents:
-                ingesting_task = asyncio.create_task(
-                    self.weaviate_manager.import_document(
-                        client,
-                        document,
-                        currentFileConfig.rag_config["Embedder"]
-                        .components[fileConfig.rag_config["Embedder"].selected]
-                        .config["Model"]
-                        .value,
-                    )
-                )
-                await ingesting_task
+    async def chunk_document(self, client, job: dict, logger: LoggerManager):
+        currentFileConfig: FileConfig = job["fileConfig"]
+        document: Document = job["documents"][0]
+
+        # Resolved for the whole import batch before the job is queued
+        duplicate_uuid = job.get("duplicate_uuid")
+        if duplicate_uuid is not None and not currentFileConfig.overwrite:
+            raise Exception(f"{document.title} already exists in Verba")
+        elif duplicate_uuid is not None and currentFileConfig.overwrite:
+            await self.weaviate_manager.delete_document(client, duplicate_uuid)
+
+        job["documents"] = await self.chunker_manager.chunk(
+            currentFileConfig.rag_config["Chunker"].selected,
+            currentFileConfig,
+            job["documents"],
+            self.embedder_manager.embedders[
+                currentFileConfig.rag_config["Embedder"].selected
+            ],
+            logger,
+        )
 
-            await logger.send_report(
-                currentFileConfig.fileID,
-                status=FileStatus.INGESTING,
-                message=f"Imported {currentFileConfig.filename} into Weaviate",
-                took=round(loop.time() - start_time, 2),
-            )
+    async def embed_document(self, client, job: dict, logger: LoggerManager):
+        currentFileConfig: FileConfig = job["fileConfig"]
+        job["documents"] = await self.embedder_manager.vectorize(
+            currentFileConfig.rag_config["Embedder"].selected,
+            currentFileConfig,
+            job["documents"],
+            logger,
+            client,
+            self.weaviate_manager,
+        )
 
-            await logger.send_report(
-                currentFileConfig.fileID,
-                status=FileStatus.DONE,
-                message=f"Import for {currentFileConfig.filename} completed successfully",
-                took=round(loop.time() - start_time, 2),
+    async def ingest_document(self, client, job: dict, logger: LoggerManager):
+        loop = asyncio.get_running_loop()
+        currentFileConfig: FileConfig = job["fileConfig"]
+        fileConfig: FileConfig = job["originalFileConfig"]
+
+        for document in job["documents"]:
+            await self.weaviate_manager.import_document(
+                client,
+                document,
+                currentFileConfig.rag_config["Embedder"]
+                .components[fileConfig.rag_config["Embedder"].selected]
+                .config["Model"]
+                .value,
             )
-        except Exception as e:
+        # Chunks and vectors are stored in Weaviate, don't keep them until the whole import ends
+        job["chunks"] = release_chunks(job)
+
+        await logger.send_report(
+            currentFileConfig.fileID,
+            status=FileStatus.INGESTING,
+            message=f"Imported {currentFileConfig.filename} into Weaviate",
+            took=round(loop.time() - job["start_time"], 2),
+        )
+
+        await logger.send_report(
+            currentFileConfig.fileID,
+            status=FileStatus.DONE,
+            message=f"Import for {currentFileConfig.filename} completed successfully",
+            took=round(loop.time() - job["start_time"], 2),
+        )
+
+    async def report_document_error(
+        self, job: dict, error: Exception, logger: LoggerManager
+    ):
+        loop = asyncio.get_running_loop()
+        try:
             await logger.send_report(
-                currentFileConfig.fileID,
+                job["fileConfig"].fileID,
                 status=FileStatus.ERROR,
-                message=f"Import for {fileConfig.filename} failed: {str(e)}",
-                took=round(loop.time() - start_time, 2),
+                message=f"Import for {job['originalFileConfig'].filename} failed: {str(error)}",
+                took=round(loop.time() - job["start_time"], 2),
             )
-            raise Exception(f"Import for {fileConfig.filename} failed: {str(e)}")
+        except Exception as e:
+            # The import continues even if the client is gone (e.g. closed websocket)
+            msg.warn(f"Couldn't report import error: {str(e)}")
 
     # Configuration
 
@@ -663,11 +790,7 @@ class VerbaManager:
 
         # Return Content based on Page
         else:
-            document = await self.weaviate_manager.get_document(
-                client, uuid, properties=["meta"]
-            )
-            config = json.loads(document["meta"])
-            embedder = config["Embedder"]["config"]["Model"]["value"]
+            embedder = await self.weaviate_manager.get_document_embedder(client, uuid)
             request_chunk_ids = [
                 i
                 for i in range(
@@ -700,6 +823,15 @@ class VerbaManager:
 
         return (content_pieces, total_batches)
 
+    # Caches
+
+    def get_cache_stats(self) -> dict:
+        return {
+            "embedding_cache": self.embedder_manager.embedding_cache.stats(),
+            "query_cache": self.embedder_manager.query_cache.stats(),
+            "retrieval_cache": self.retriever_manager.retrieval_cache.stats(),
+        }
+
     # Retrieval Augmented Generation
 
     async def retrieve_chunks(
@@ -713,11 +845,28 @@ class VerbaManager:
         retriever = rag_config["Retriever"].selected
         embedder = rag_config["Embedder"].selected
 
-        await self.weaviate_manager.add_suggestion(client, query)
+        self.weaviate_manager.add_suggestion(client, query)
 
-        vector = await self.embedder_manager.vectorize_query(
-            embedder, query, rag_config
+        max_tokens = self.generator_manager.get_context_budget(rag_config)
+        cache_key = await self.retriever_manager.get_cache_key(
+            client,
+            query,
+            rag_config,
+            self.weaviate_manager,
+            labels,
+            document_uuids,
+            max_tokens,
         )
+        cached = self.retriever_manager.retrieval_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self.retriever_manager.requires_vector(retriever, rag_config):
+            vector = await self.embedder_manager.vectorize_query(
+                embedder, query, rag_config
+            )
+        else:
+            vector = None
         documents, context = await self.retriever_manager.retrieve(
             client,
             retriever,
@@ -727,8 +876,10 @@ class VerbaManager:
             self.weaviate_manager,
             labels,
             document_uuids,
+            max_tokens,
         )
 
+        self.retriever_manager.retrieval_cache.put(cache_key, (documents, context))
         return (documents, context)
 
     async def generate_stream_answer(